@@ -1,3 +1,6 @@
+from collections import defaultdict, deque
+
+
 def two_sum(nums, target):
     """
     Находит индексы двух чисел в массиве, сумма которых равна целевому значению.
@@ -36,6 +39,89 @@ def two_sum(nums, target):
     return []
 
 
+class SlidingWindowTwoSum:
+    """
+    Поиск пары с суммой target среди последних window событий потока.
+    
+    Хранит значения окна и словарь значение -> индексы (в порядке поступления),
+    а также число пар в окне с суммой target. Добавление и вытеснение
+    выполняются за O(1) (амортизированно), проверка наличия пары — за O(1).
+    
+    Индексы — позиции событий в потоке (начиная с 0).
+    
+    Пример:
+        >>> window = SlidingWindowTwoSum(target=9, window=3)
+        >>> window.push(2)
+        []
+        >>> window.push(7)
+        [0, 1]
+        >>> window.push(11), window.push(15)
+        ([], [])
+        >>> window.has_pair()
+        False
+    """
+    
+    def __init__(self, target, window):
+        """
+        Аргументы:
+            target: int - целевое значение суммы
+            window: int - размер окна (количество последних событий)
+        """
+        if window < 1:
+            raise ValueError("Размер окна должен быть положительным")
+        self.target = target
+        self.window = window
+        self.pair_count = 0
+        self._values = deque()
+        self._indices = defaultdict(deque)
+        self._next_index = 0
+    
+    def push(self, value):
+        """
+        Добавляет событие в окно, вытесняя устаревшее.
+        
+        Аргументы:
+            value: int - значение события
+        
+        Возвращает:
+            List[int] - индексы пары [j, i], где i - индекс нового события, а j - индекс
+            последнего дополнения в окне (как в two_sum); пустой список, если пары нет
+        """
+        index = self._next_index
+        self._next_index += 1
+        
+        # Вытеснение события, вышедшего за пределы окна
+        if len(self._values) == self.window:
+            self._evict()
+        
+        # Новые пары образуются со всеми дополнениями в окне
+        complement = self.target - value
+        complement_indices = self._indices.get(complement)
+        result = []
+        if complement_indices:
+            self.pair_count += len(complement_indices)
+            result = [complement_indices[-1], index]
+        
+        self._values.append(value)
+        self._indices[value].append(index)
+        return result
+    
+    def has_pair(self):
+        """Проверяет, есть ли в текущем окне пара с суммой target"""
+        return self.pair_count > 0
+    
+    def _evict(self):
+        value = self._values.popleft()
+        indices = self._indices[value]
+        indices.popleft()
+        if not indices:
+            del self._indices[value]
+        # Удаляются пары вытесненного события с оставшимися в окне
+        complement_indices = self._indices.get(self.target - value)
+        if complement_indices:
+            self.pair_count -= len(complement_indices)
+
+
 if __name__ == "__main__":
     # Пример использования
     nums = [2, 7, 11, 15]
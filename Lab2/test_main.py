@@ -1,5 +1,6 @@
+import random
 import unittest
-from main import two_sum
+from main import two_sum, SlidingWindowTwoSum
 
 
 class TestTwoSum(unittest.TestCase):
@@ -54,6 +55,57 @@ class TestTwoSum(unittest.TestCase):
         self.assertEqual(result, expected)
 
 
+class TestSlidingWindowTwoSum(unittest.TestCase):
+    """Тестирует поиск пары в скользящем окне потока"""
+    
+    def test_pair_within_window(self):
+        """Тест пары внутри окна: индексы в стиле two_sum"""
+        window = SlidingWindowTwoSum(target=9, window=3)
+        self.assertEqual(window.push(2), [])
+        self.assertEqual(window.push(7), [0, 1])
+        self.assertTrue(window.has_pair())
+    
+    def test_pair_expires(self):
+        """Тест вытеснения: пара перестает учитываться после выхода из окна"""
+        window = SlidingWindowTwoSum(target=9, window=2)
+        window.push(2)
+        window.push(7)
+        window.push(1)
+        self.assertFalse(window.has_pair())
+        self.assertEqual(window.push(8), [2, 3])
+    
+    def test_complement_outside_window(self):
+        """Тест дополнения, вытесненного из окна"""
+        window = SlidingWindowTwoSum(target=6, window=2)
+        window.push(3)
+        window.push(1)
+        self.assertEqual(window.push(3), [])
+    
+    def test_duplicate_numbers(self):
+        """Тест повторяющихся чисел: возвращается последний индекс дополнения"""
+        window = SlidingWindowTwoSum(target=6, window=4)
+        window.push(3)
+        window.push(3)
+        self.assertEqual(window.push(3), [1, 2])
+        self.assertEqual(window.pair_count, 3)
+    
+    def test_matches_brute_force(self):
+        """Тест совпадения has_pair с полным перебором окна"""
+        rng = random.Random(12)
+        size = 5
+        window = SlidingWindowTwoSum(target=10, window=size)
+        stream = [rng.randint(0, 10) for _ in range(300)]
+        for i, value in enumerate(stream):
+            window.push(value)
+            current = stream[max(0, i - size + 1):i + 1]
+            self.assertEqual(window.has_pair(), two_sum(current, 10) != [])
+    
+    def test_invalid_window(self):
+        """Тест некорректного размера окна"""
+        with self.assertRaises(ValueError):
+            SlidingWindowTwoSum(target=1, window=0)
+
+
 if __name__ == "__main__":
     # Запуск тестов
     unittest.main(verbosity=2)
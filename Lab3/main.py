@@ -1,6 +1,8 @@
-import json
+import sys
 from typing import Optional, Dict, Any, Callable
 
+from tree_json import dump_tree
+
 
 def gen_bin_tree(
     height: int = 4, 
@@ -59,7 +61,9 @@ if __name__ == "__main__":
     # Демонстрация работы функции с параметрами по умолчанию
     default_tree = gen_bin_tree()
     print("Бинарное дерево с параметрами по умолчанию:")
-    print(json.dumps(default_tree, indent=2))
+    # Дерево пишется в stdout порциями, без сборки всего JSON в одну строку
+    dump_tree(default_tree, sys.stdout, indent=2)
+    print()
     
     print("\n" + "="*50)
     
@@ -71,5 +75,6 @@ if __name__ == "__main__":
         right_leaf=lambda x: x + 3
     )
     print("Бинарное дерево с пользовательскими параметрами:")
-    print(json.dumps(custom_tree, indent=2))
+    dump_tree(custom_tree, sys.stdout, indent=2)
+    print()
 
@@ -0,0 +1,99 @@
+"""
+Тесты потоковой записи и чтения бинарного дерева в JSON (tree_json.py).
+"""
+
+import io
+import json
+import unittest
+
+from main import gen_bin_tree
+from tree_json import dump_tree, load_tree, iter_tree_json
+
+
+class TestTreeJson(unittest.TestCase):
+    """Тестовый класс для потоковой записи и чтения дерева в JSON"""
+
+    class Node:
+        """Узел с атрибутами value/left/right (как TreeNode из Lab4)"""
+
+        def __init__(self, value):
+            self.value = value
+            self.left = None
+            self.right = None
+
+    def setUp(self):
+        self.tree = gen_bin_tree(height=6, root=1, left_leaf=lambda x: x + 1, right_leaf=lambda x: x * 2)
+
+    def test_matches_json_dumps(self):
+        """Результат совпадает с json.dumps при любом размере буфера"""
+        cases = [
+            ({}, json.dumps(self.tree, indent=2)),
+            ({'indent': 4}, json.dumps(self.tree, indent=4)),
+            ({'indent': None}, json.dumps(self.tree)),
+            ({'compact': True}, json.dumps(self.tree, separators=(',', ':'))),
+        ]
+        for kwargs, expected in cases:
+            for buffer_size in (1, 50, 1 << 16):
+                with self.subTest(kwargs=kwargs, buffer_size=buffer_size):
+                    out = io.StringIO()
+                    dump_tree(self.tree, out, buffer_size=buffer_size, **kwargs)
+                    self.assertEqual(out.getvalue(), expected)
+
+    def test_bounded_writes(self):
+        """Запись идет порциями, не одной строкой"""
+        writes = []
+
+        class Recorder:
+            def write(self, text):
+                writes.append(len(text))
+
+        dump_tree(self.tree, Recorder(), buffer_size=256)
+        self.assertGreater(len(writes), 1)
+        # Порция превышает буфер не больше чем на один фрагмент
+        self.assertLess(max(writes), 256 + 100)
+
+    def test_round_trip(self):
+        """Чтение блоками любого размера восстанавливает дерево"""
+        for compact in (False, True):
+            out = io.StringIO()
+            dump_tree(self.tree, out, compact=compact)
+            for chunk_size in (1, 7, 1 << 16):
+                with self.subTest(compact=compact, chunk_size=chunk_size):
+                    self.assertEqual(load_tree(io.StringIO(out.getvalue()), chunk_size=chunk_size), self.tree)
+
+    def test_round_trip_floats(self):
+        """Дробные числа и экспоненты, разорванные границей блока, читаются целиком"""
+        trees = [
+            gen_bin_tree(3, 1.5, lambda x: x * 2.25, lambda x: x + 0.125),
+            gen_bin_tree(4, -1e-7, lambda x: x * 1e5, lambda x: -x * 3.5e20),
+        ]
+        for tree in trees:
+            for compact in (False, True):
+                out = io.StringIO()
+                dump_tree(tree, out, compact=compact)
+                for chunk_size in range(1, 16):
+                    with self.subTest(root=tree['value'], compact=compact, chunk_size=chunk_size):
+                        self.assertEqual(load_tree(io.StringIO(out.getvalue()), chunk_size=chunk_size), tree)
+
+    def test_node_objects(self):
+        """Запись узлов-объектов и чтение в узлы через node_factory"""
+        root = load_tree(io.StringIO(json.dumps(self.tree)), node_factory=self.Node, chunk_size=5)
+        self.assertIsInstance(root, self.Node)
+        self.assertEqual(root.right.left.value, 3)
+        self.assertEqual(''.join(iter_tree_json(root)), json.dumps(self.tree, indent=2))
+
+    def test_empty_tree_and_invalid_input(self):
+        """Пустое дерево и некорректный текст"""
+        out = io.StringIO()
+        dump_tree(None, out)
+        self.assertEqual(out.getvalue(), 'null')
+        self.assertIsNone(load_tree(io.StringIO('null')))
+        with self.assertRaises(ValueError):
+            load_tree(io.StringIO('{"value": 1, "left": null'))
+        with self.assertRaises(ValueError):
+            load_tree(io.StringIO('[1, 2]'))
+
+
+if __name__ == "__main__":
+    # Запуск тестов
+    unittest.main(argv=[''], verbosity=2, exit=False)
@@ -0,0 +1,240 @@
+"""
+Потоковая запись и чтение бинарных деревьев в формате JSON.
+
+dump_tree пишет дерево (словари gen_bin_tree или узлы с атрибутами
+value/left/right, например TreeNode) в файл порциями через буфер
+ограниченного размера, не собирая весь текст в одну строку. Обход
+итеративный, поэтому высота дерева не ограничена лимитом рекурсии.
+Результат совпадает с json.dumps(tree, indent=...) (или с компактным
+json.dumps(tree, separators=(',', ':'))).
+
+load_tree читает файл блоками фиксированного размера и восстанавливает
+дерево, не держа в памяти весь текст.
+"""
+
+import json
+import re
+from typing import Any, Callable, IO, Iterator, Optional
+
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+def _node_fields(node):
+    """Значение и потомки узла-словаря или узла-объекта"""
+    if isinstance(node, dict):
+        return node['value'], node['left'], node['right']
+    return node.value, node.left, node.right
+
+
+def iter_tree_json(tree: Any, indent: Optional[int] = 2, compact: bool = False) -> Iterator[str]:
+    """
+    Генерирует JSON-представление дерева небольшими фрагментами
+
+    Args:
+        tree: Корень дерева (словарь, объект с атрибутами value/left/right или None)
+        indent (Optional[int]): Отступ (как в json.dumps); None — все в одну строку
+        compact (bool): Компактный режим без пробелов и переводов строк
+
+    Yields:
+        str: Фрагменты текста; их конкатенация равна json.dumps(tree, indent=indent)
+    """
+    if compact:
+        indent = None
+        item_separator, key_separator = ',', ':'
+    elif indent is None:
+        item_separator, key_separator = ', ', ': '
+    else:
+        item_separator, key_separator = ',', ': '
+
+    # Стек содержит готовые фрагменты (str) и узлы для вывода (node, уровень):
+    # в нем не больше трех элементов на уровень, т.е. O(высоты)
+    stack = [(tree, 0)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+            continue
+        node, level = item
+        if node is None:
+            yield 'null'
+            continue
+        value, left, right = _node_fields(node)
+        if indent is None:
+            newline = closing = ''
+        else:
+            newline = '\n' + ' ' * (indent * (level + 1))
+            closing = '\n' + ' ' * (indent * level)
+        yield f'{{{newline}"value"{key_separator}{json.dumps(value)}{item_separator}{newline}"left"{key_separator}'
+        stack.append(closing + '}')
+        stack.append((right, level + 1))
+        stack.append(f'{item_separator}{newline}"right"{key_separator}')
+        stack.append((left, level + 1))
+
+
+def dump_tree(
+    tree: Any,
+    fp: IO[str],
+    indent: Optional[int] = 2,
+    compact: bool = False,
+    buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> None:
+    """
+    Записывает дерево в текстовый файл в формате JSON
+
+    Фрагменты накапливаются в буфере и записываются в fp, как только
+    их суммарная длина достигает buffer_size символов.
+
+    Args:
+        tree: Корень дерева (словарь, объект с атрибутами value/left/right или None)
+        fp (IO[str]): Открытый на запись текстовый файл (или sys.stdout)
+        indent (Optional[int]): Отступ (как в json.dumps)
+        compact (bool): Компактный режим без пробелов и переводов строк
+        buffer_size (int): Размер буфера в символах
+
+    Examples:
+        >>> with open('tree.json', 'w') as f:
+        ...     dump_tree(gen_bin_tree(20, 1, lambda x: x + 1, lambda x: x * 2), f, compact=True)
+    """
+    buffer = []
+    buffered = 0
+    for chunk in iter_tree_json(tree, indent, compact):
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= buffer_size:
+            fp.write(''.join(buffer))
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        fp.write(''.join(buffer))
+
+
+# Лексемы JSON вне строк: структурные символы, числа и литералы
+_WHITESPACE = re.compile(r'\s*')
+_NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?')
+_LITERAL = re.compile(r'true|false|null')
+# Символы, которыми может продолжаться число, оборванное на границе блока (1. или 1e)
+_NUMBER_CONTINUATION = frozenset('0123456789.eE+-')
+_STRING_END = re.compile(r'(?<!\\)(?:\\\\)*"')
+
+
+def _iter_tokens(fp: IO[str], chunk_size: int) -> Iterator[Any]:
+    """
+    Разбивает текст JSON на лексемы, читая файл блоками по chunk_size символов
+
+    Yields:
+        Структурные символы ('{', '}', ':', ',') как str, а строки, числа
+        и литералы — как кортеж ('scalar', значение)
+    """
+    text = ''
+    pos = 0
+    eof = False
+
+    def refill():
+        nonlocal text, pos, eof
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            eof = True
+        # Прочитанная часть отбрасывается: в памяти остается блок и незавершенная лексема
+        text = text[pos:] + chunk
+        pos = 0
+
+    while True:
+        pos = _WHITESPACE.match(text, pos).end()
+        if pos >= len(text):
+            if eof:
+                return
+            refill()
+            continue
+        char = text[pos]
+        if char in '{}:,':
+            pos += 1
+            yield char
+            continue
+        if char == '[':
+            raise ValueError("Массивы не поддерживаются: ожидается дерево из объектов value/left/right")
+        if char == '"':
+            match = _STRING_END.search(text, pos + 1)
+        elif char in 'tfn':
+            match = _LITERAL.match(text, pos)
+        else:
+            match = _NUMBER.match(text, pos)
+            # Число, оборванное на границе блока, совпадает лишь частично: 1 вместо 1.5
+            if match is not None and match.end() < len(text) and text[match.end()] in _NUMBER_CONTINUATION \
+                    and not eof:
+                refill()
+                continue
+        # Лексема может продолжаться в следующем блоке
+        if (match is None or match.end() == len(text)) and not eof:
+            refill()
+            continue
+        if match is None:
+            raise ValueError(f"Некорректный JSON: {text[pos:pos + 20]!r}")
+        yield 'scalar', json.loads(text[pos:match.end()])
+        pos = match.end()
+
+
+def load_tree(
+    fp: IO[str],
+    node_factory: Optional[Callable[[Any], Any]] = None,
+    chunk_size: int = DEFAULT_BUFFER_SIZE
+) -> Any:
+    """
+    Восстанавливает дерево из JSON, записанного dump_tree (или json.dump)
+
+    Args:
+        fp (IO[str]): Открытый на чтение текстовый файл
+        node_factory (Callable): Конструктор узла по значению (например, TreeNode);
+                                 None — дерево из словарей, как у gen_bin_tree
+        chunk_size (int): Размер блока чтения в символах
+
+    Returns:
+        Корень дерева (словарь или узел node_factory) или None
+
+    Raises:
+        ValueError: Если текст не является деревом в формате gen_bin_tree
+    """
+    stack = []  # Открытые объекты: [словарь, ожидающий ключ]
+    root = None
+    expect_key = False
+
+    def attach(value):
+        nonlocal root
+        if not stack:
+            root = value
+            return
+        container = stack[-1]
+        if container[1] is None:
+            raise ValueError("Некорректный JSON: значение без ключа")
+        container[0][container[1]] = value
+        container[1] = None
+
+    for token in _iter_tokens(fp, chunk_size):
+        if token == '{':
+            stack.append([{}, None])
+            expect_key = True
+        elif token == '}':
+            if not stack:
+                raise ValueError("Некорректный JSON: лишняя закрывающая скобка")
+            node, _ = stack.pop()
+            if node_factory is not None and node:
+                try:
+                    value, left, right = _node_fields(node)
+                except KeyError as e:
+                    raise ValueError(f"Некорректный узел дерева: нет ключа {e}") from None
+                node = node_factory(value)
+                node.left, node.right = left, right
+            attach(node)
+        elif token == ',':
+            expect_key = bool(stack)
+        elif token == ':':
+            continue
+        elif expect_key:
+            stack[-1][1] = token[1]
+            expect_key = False
+        else:
+            attach(token[1])
+
+    if stack:
+        raise ValueError("Некорректный JSON: незакрытый объект")
+    return root
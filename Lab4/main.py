@@ -8,12 +8,25 @@
 from collections import deque
 from typing import Any, Callable, Optional, Dict
 
+from tree_engine import TreeNode, generate_tree
+
+
+# Нерекурсивные стратегии tree_engine, допустимые для функций этого модуля
+ITERATIVE_STRATEGIES = ('bfs', 'dfs', 'level')
+
+
+def _check_strategy(strategy: str) -> None:
+    """Проверяет, что стратегия нерекурсивная ('recursive' и 'auto' не допускаются)."""
+    if strategy not in ITERATIVE_STRATEGIES:
+        raise ValueError(f"Неизвестная нерекурсивная стратегия: {strategy}")
+
 
 def gen_bin_tree(
     height: Optional[int] = None,
     root: Optional[Any] = None,
     left_leaf: Optional[Callable[[Any], Any]] = None,
-    right_leaf: Optional[Callable[[Any], Any]] = None
+    right_leaf: Optional[Callable[[Any], Any]] = None,
+    strategy: str = 'bfs'
 ) -> Optional[Dict[str, Any]]:
     """
     Генерирует бинарное дерево нерекурсивным способом с заданными параметрами.
@@ -29,62 +42,20 @@ def gen_bin_tree(
         root: Значение корневого узла
         left_leaf: Функция для вычисления значения левого потомка из значения родителя
         right_leaf: Функция для вычисления значения правого потомка из значения родителя
+        strategy: Нерекурсивная стратегия построения: 'bfs' (по умолчанию), 'dfs'
+                  или 'level' (см. tree_engine)
         
     Возвращает:
         Словарь, представляющий структуру бинарного дерева с ключами:
         'value', 'left', 'right'. Возвращает None если высота равна 0.
         
     Вызывает:
-        ValueError: Если высота отрицательная
+        ValueError: Если высота отрицательная или стратегия не из ITERATIVE_STRATEGIES
         TypeError: Если left_leaf или right_leaf не являются вызываемыми объектами
     """
-    # Установка значений по умолчанию если не предоставлены (вариант 12)
-    if height is None:
-        height = 4
-    if root is None:
-        root = 12
-    if left_leaf is None:
-        left_leaf = lambda x: x ** 3
-    if right_leaf is None:
-        right_leaf = lambda x: (x * 2) - 1
-    
-    # Проверка входных данных
-    if height < 0:
-        raise ValueError("Высота не может быть отрицательной")
-    if not callable(left_leaf):
-        raise TypeError("left_leaf должен быть вызываемым объектом")
-    if not callable(right_leaf):
-        raise TypeError("right_leaf должен быть вызываемым объектом")
-    
-    # Возврат None для пустого дерева
-    if height == 0:
-        return None
-    
-    # Создание корневого узла
-    tree = {'value': root, 'left': None, 'right': None}
-    
-    # Использование очереди для обхода в ширину (нерекурсивный подход)
-    queue = deque()
-    queue.append((tree, 1))  # (узел, текущая_глубина)
-    
-    while queue:
-        current_node, current_depth = queue.popleft()
-        
-        # Остановка построения если достигнута желаемая высота
-        if current_depth >= height:
-            continue
-            
-        # Создание левого потомка
-        left_value = left_leaf(current_node['value'])
-        current_node['left'] = {'value': left_value, 'left': None, 'right': None}
-        queue.append((current_node['left'], current_depth + 1))
-        
-        # Создание правого потомка  
-        right_value = right_leaf(current_node['value'])
-        current_node['right'] = {'value': right_value, 'left': None, 'right': None}
-        queue.append((current_node['right'], current_depth + 1))
-    
-    return tree
+    _check_strategy(strategy)
+    # Значения по умолчанию, проверка и построение — в общем движке tree_engine
+    return generate_tree(height, root, left_leaf, right_leaf, strategy=strategy, output='dict')
 
 
 def tree_to_list(tree: Optional[Dict[str, Any]]) -> list:
@@ -149,65 +120,19 @@ def get_tree_height(tree: Optional[Dict[str, Any]]) -> int:
     return max_depth
 
 
-# Альтернативная реализация с использованием класса Node
-class TreeNode:
-    """Класс узла для бинарного дерева с использованием пользовательского класса вместо словаря."""
-    
-    def __init__(self, value: Any):
-        self.value = value
-        self.left = None
-        self.right = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Преобразует TreeNode в представление в виде словаря."""
-        result = {'value': self.value, 'left': None, 'right': None}
-        if self.left:
-            result['left'] = self.left.to_dict()
-        if self.right:
-            result['right'] = self.right.to_dict()
-        return result
-
-
+# Альтернативная реализация с использованием класса Node (TreeNode определен в tree_engine)
 def gen_bin_tree_class(
     height: Optional[int] = None,
     root: Optional[Any] = None, 
     left_leaf: Optional[Callable[[Any], Any]] = None,
-    right_leaf: Optional[Callable[[Any], Any]] = None
+    right_leaf: Optional[Callable[[Any], Any]] = None,
+    strategy: str = 'bfs'
 ) -> Optional[TreeNode]:
     """
     Генерирует бинарное дерево с использованием класса TreeNode вместо словаря.
     
-    Использует те же параметры и логику, что и gen_bin_tree, но возвращает
-    экземпляры TreeNode вместо словарей.
+    Использует те же параметры, значения по умолчанию и проверку, что и gen_bin_tree,
+    но возвращает экземпляры TreeNode вместо словарей.
     """
-    if height is None:
-        height = 4
-    if root is None:
-        root = 12
-    if left_leaf is None:
-        left_leaf = lambda x: x ** 3
-    if right_leaf is None:
-        right_leaf = lambda x: (x * 2) - 1
-    
-    if height == 0:
-        return None
-    
-    root_node = TreeNode(root)
-    queue = deque()
-    queue.append((root_node, 1))
-    
-    while queue:
-        current_node, current_depth = queue.popleft()
-        
-        if current_depth >= height:
-            continue
-            
-        left_value = left_leaf(current_node.value)
-        current_node.left = TreeNode(left_value)
-        queue.append((current_node.left, current_depth + 1))
-        
-        right_value = right_leaf(current_node.value)
-        current_node.right = TreeNode(right_value)
-        queue.append((current_node.right, current_depth + 1))
-    
-    return root_node
+    _check_strategy(strategy)
+    return generate_tree(height, root, left_leaf, right_leaf, strategy=strategy, output='node')
@@ -7,6 +7,9 @@
 
 import unittest
 from main import gen_bin_tree, tree_to_list, get_tree_height, gen_bin_tree_class, TreeNode
+from tree_engine import generate_tree, choose_strategy, benchmark_matrix, STRATEGIES
+from tree_index import TreeIndex, position_to_path, path_to_position, node_at
+from tree_stream import iter_tree, fold_tree, LevelSums, LevelMax, Leaves, Histogram, ORDERS
 
 
 class TestBinaryTree(unittest.TestCase):
@@ -171,6 +174,183 @@ class TestBinaryTree(unittest.TestCase):
         self.assertEqual(tree['right']['right']['value'], (23*2)-1)
 
 
+class TestTreeEngine(unittest.TestCase):
+    """Тестовые случаи для единого движка генерации деревьев."""
+    
+    def test_strategies_agree(self):
+        """Тест совпадения результатов всех стратегий во всех представлениях."""
+        expected = gen_bin_tree(height=5, root=2)
+        for strategy in STRATEGIES:
+            with self.subTest(strategy=strategy):
+                self.assertEqual(generate_tree(5, 2, strategy=strategy, output='dict'), expected)
+                self.assertEqual(generate_tree(5, 2, strategy=strategy, output='node').to_dict(), expected)
+                self.assertEqual(generate_tree(5, 2, strategy=strategy, output='array'), tree_to_list(expected))
+        
+    def test_recursive_matches_lab3(self):
+        """Тест совпадения рекурсивной стратегии с деревом из Lab3."""
+        tree = generate_tree(2, 3, lambda x: x + 2, lambda x: x * 3, strategy='recursive')
+        expected = {
+            'value': 3,
+            'left': {'value': 5, 'left': None, 'right': None},
+            'right': {'value': 9, 'left': None, 'right': None}
+        }
+        self.assertEqual(tree, expected)
+        
+    def test_empty_tree(self):
+        """Тест высоты 0 для всех представлений."""
+        self.assertIsNone(generate_tree(0, output='dict'))
+        self.assertIsNone(generate_tree(0, output='node'))
+        self.assertEqual(generate_tree(0, output='array'), [])
+        
+    def test_unified_validation(self):
+        """Тест единой проверки параметров (в том числе для gen_bin_tree_class)."""
+        with self.assertRaises(ValueError):
+            gen_bin_tree_class(height=-1)
+        with self.assertRaises(TypeError):
+            gen_bin_tree_class(left_leaf=5)
+        with self.assertRaises(ValueError):
+            generate_tree(3, strategy='unknown')
+        for strategy in ('recursive', 'auto', 'unknown'):
+            with self.subTest(strategy=strategy):
+                with self.assertRaises(ValueError):
+                    gen_bin_tree(3, strategy=strategy)
+                with self.assertRaises(ValueError):
+                    gen_bin_tree_class(3, strategy=strategy)
+        with self.assertRaises(ValueError):
+            generate_tree(3, output='unknown')
+            
+    def test_choose_strategy(self):
+        """Тест автоматического выбора стратегии."""
+        python_rule = lambda x: x + 1
+        self.assertEqual(choose_strategy(4, 'dict', python_rule, python_rule), 'recursive')
+        self.assertEqual(choose_strategy(16, 'dict', python_rule, python_rule), 'level')
+        self.assertEqual(choose_strategy(4, 'array', python_rule, python_rule), 'level')
+        self.assertEqual(choose_strategy(4, 'node', abs, hex), 'level')
+        
+    def test_benchmark_matrix(self):
+        """Тест формата матрицы бенчмарка."""
+        matrix = benchmark_matrix(heights=(3,), runs=1)
+        self.assertEqual(set(matrix), {(3, 'dict'), (3, 'node'), (3, 'array')})
+        for timings in matrix.values():
+            self.assertEqual(set(timings), set(STRATEGIES))
+
+
+class TestTreeStream(unittest.TestCase):
+    """Тестовые случаи для потоковой генерации и агрегации."""
+    
+    def test_matches_generated_tree(self):
+        """Тест совпадения потока значений с деревом gen_bin_tree."""
+        expected = tree_to_list(gen_bin_tree(height=5, root=2))
+        for order in ORDERS:
+            with self.subTest(order=order):
+                items = list(iter_tree(5, 2, order=order))
+                self.assertEqual(len(items), 2 ** 5 - 1)
+                # Индекс в порядке уровней: 2^depth - 1 + position
+                values = {(1 << depth) - 1 + position: value for depth, position, value in items}
+                self.assertEqual([values[i] for i in range(len(expected))], expected)
+        
+    def test_level_order(self):
+        """Тест порядка выдачи по уровням."""
+        items = list(iter_tree(3, 1, lambda x: x + 1, lambda x: x * 2, order='level'))
+        self.assertEqual(items, [(0, 0, 1), (1, 0, 2), (1, 1, 2), (2, 0, 3), (2, 1, 4), (2, 2, 3), (2, 3, 4)])
+        
+    def test_reducers(self):
+        """Тест агрегаторов в обоих порядках обхода."""
+        levels = generate_tree(6, 1, lambda x: x + 1, lambda x: x * 2, output='array')
+        level_lists = [levels[(1 << d) - 1:(1 << (d + 1)) - 1] for d in range(6)]
+        for order in ORDERS:
+            with self.subTest(order=order):
+                result = fold_tree(
+                    {'sums': LevelSums(), 'max': LevelMax(), 'leaves': Leaves(), 'hist': Histogram(key=lambda v: v % 3)},
+                    6, 1, lambda x: x + 1, lambda x: x * 2, order=order
+                )
+                self.assertEqual(result['sums'], [sum(level) for level in level_lists])
+                self.assertEqual(result['max'], [max(level) for level in level_lists])
+                self.assertEqual(sorted(result['leaves']), sorted(level_lists[-1]))
+                self.assertEqual(sum(result['hist'].values()), 2 ** 6 - 1)
+        
+    def test_dfs_is_lazy(self):
+        """Тест ленивости: первые значения выдаются до вычисления всего дерева."""
+        calls = []
+        rule = lambda x: calls.append(x) or x + 1
+        stream = iter_tree(30, 0, rule, rule)
+        for _ in range(30):
+            next(stream)
+        self.assertLessEqual(len(calls), 2 * 30)
+        
+    def test_invalid_params(self):
+        """Тест проверки параметров."""
+        self.assertEqual(list(iter_tree(0)), [])
+        with self.assertRaises(ValueError):
+            iter_tree(-1)
+        with self.assertRaises(ValueError):
+            iter_tree(3, order='random')
+
+
+class TestTreeIndex(unittest.TestCase):
+    """Тестовые случаи для индекса значений дерева."""
+    
+    def setUp(self):
+        self.rules = (lambda x: x + 1, lambda x: x * 2)
+        self.values = generate_tree(6, 1, *self.rules, output='array')
+        
+    def expected_positions(self, value):
+        return [i for i, v in enumerate(self.values) if v == value]
+        
+    def test_built_during_generation(self):
+        """Тест индекса, построенного во время генерации, для всех стратегий и представлений."""
+        for strategy in STRATEGIES:
+            for output in ('dict', 'node', 'array'):
+                with self.subTest(strategy=strategy, output=output):
+                    tree, index = TreeIndex.generate(6, 1, *self.rules, strategy=strategy, output=output)
+                    self.assertEqual(index.size, len(self.values))
+                    for value in set(self.values):
+                        self.assertEqual(list(index.positions(value)), self.expected_positions(value))
+        
+    def test_built_from_tree(self):
+        """Тест индекса по готовому дереву и навигации по найденным путям."""
+        tree = gen_bin_tree(height=6, root=1, left_leaf=self.rules[0], right_leaf=self.rules[1])
+        index = TreeIndex.from_tree(tree)
+        self.assertEqual(len(index), len(set(self.values)))
+        for value in set(self.values):
+            self.assertEqual(index.count(value), self.values.count(value))
+            for path in index.paths(value):
+                node = tree
+                for step in path:
+                    node = node[step]
+                self.assertEqual(node['value'], value)
+        
+    def test_lookups(self):
+        """Тест проверки наличия и пакетного поиска."""
+        index = TreeIndex.from_values(self.values)
+        self.assertIn(4, index)
+        self.assertNotIn(-1, index)
+        self.assertEqual(index.contains_many([1, -1, 32]), [True, False, True])
+        found = index.lookup_many([2, -1])
+        self.assertEqual(list(found[2]), [1, 2])
+        self.assertEqual(len(found[-1]), 0)
+        
+    def test_positions_not_copied(self):
+        """Тест: позиции повторяющегося значения сортируются один раз и не копируются."""
+        tree, index = TreeIndex.generate(6, 1, *self.rules, strategy='dfs', output='array')
+        value = max(set(self.values), key=self.values.count)
+        first = index.positions(value)
+        self.assertEqual(list(first), self.expected_positions(value))
+        self.assertIs(index.positions(value), first)
+        self.assertIs(index.lookup_many([value])[value], first)
+        
+    def test_paths_and_positions(self):
+        """Тест преобразования позиций в пути и обратно."""
+        self.assertEqual(position_to_path(0), ())
+        self.assertEqual(position_to_path(11), ('right', 'left', 'left'))
+        for position in range(63):
+            self.assertEqual(path_to_position(position_to_path(position)), position)
+        tree = generate_tree(3, 1, *self.rules, output='node')
+        self.assertEqual(node_at(tree, 5).value, 3)
+        with self.assertRaises(IndexError):
+            node_at(tree, 7)
+
+
 if __name__ == '__main__':
     # Для совместимости с Google Colab
     unittest.main(argv=[''], verbosity=2, exit=False)
@@ -0,0 +1,365 @@
+"""
+Единый движок генерации бинарных деревьев.
+
+Объединяет рекурсивную генерацию (Lab3) и обход в ширину (Lab4) в один
+движок с выбираемой стратегией построения и выбираемым представлением
+результата. Значения по умолчанию (вариант 12) и проверка параметров
+общие для всех комбинаций.
+
+Стратегии:
+    'recursive' — рекурсивный спуск (глубина ограничена лимитом рекурсии)
+    'bfs'       — обход в ширину с очередью
+    'dfs'       — обход в глубину с явным стеком
+    'level'     — поуровневое вычисление: значения уровня получаются через map
+                  по предыдущему уровню, затем дерево собирается снизу вверх
+    'auto'      — выбор по высоте, представлению и типу правил (choose_strategy)
+
+Представления:
+    'dict'  — словари {'value', 'left', 'right'}
+    'node'  — экземпляры TreeNode
+    'array' — список значений в порядке уровней (потомки узла i — 2i+1 и 2i+2)
+"""
+
+import timeit
+import types
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+
+STRATEGIES = ('recursive', 'bfs', 'dfs', 'level')
+OUTPUTS = ('dict', 'node', 'array')
+
+# Встроенные функции вызываются из map без интерпретации байткода
+_BUILTIN_RULE_TYPES = (types.BuiltinFunctionType, types.BuiltinMethodType, types.MethodWrapperType)
+
+
+class TreeNode:
+    """Класс узла для бинарного дерева с использованием пользовательского класса вместо словаря."""
+
+    def __init__(self, value: Any):
+        self.value = value
+        self.left = None
+        self.right = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Преобразует TreeNode в представление в виде словаря."""
+        result = {'value': self.value, 'left': None, 'right': None}
+        if self.left:
+            result['left'] = self.left.to_dict()
+        if self.right:
+            result['right'] = self.right.to_dict()
+        return result
+
+
+def resolve_params(
+    height: Optional[int] = None,
+    root: Optional[Any] = None,
+    left_leaf: Optional[Callable[[Any], Any]] = None,
+    right_leaf: Optional[Callable[[Any], Any]] = None
+):
+    """
+    Подставляет значения по умолчанию (вариант 12) и проверяет параметры.
+
+    Возвращает:
+        Кортеж (height, root, left_leaf, right_leaf)
+
+    Вызывает:
+        ValueError: Если высота отрицательная
+        TypeError: Если left_leaf или right_leaf не являются вызываемыми объектами
+    """
+    if height is None:
+        height = 4
+    if root is None:
+        root = 12
+    if left_leaf is None:
+        left_leaf = lambda x: x ** 3
+    if right_leaf is None:
+        right_leaf = lambda x: (x * 2) - 1
+
+    if height < 0:
+        raise ValueError("Высота не может быть отрицательной")
+    if not callable(left_leaf):
+        raise TypeError("left_leaf должен быть вызываемым объектом")
+    if not callable(right_leaf):
+        raise TypeError("right_leaf должен быть вызываемым объектом")
+
+    return height, root, left_leaf, right_leaf
+
+
+# ------------------------------
+# Представления результата
+# ------------------------------
+class _DictBuilder:
+    @staticmethod
+    def new(value, index):
+        return {'value': value, 'left': None, 'right': None}
+
+    @staticmethod
+    def attach(parent, left, right):
+        parent['left'] = left
+        parent['right'] = right
+
+
+class _NodeBuilder:
+    @staticmethod
+    def new(value, index):
+        return TreeNode(value)
+
+    @staticmethod
+    def attach(parent, left, right):
+        parent.left = left
+        parent.right = right
+
+
+class _IndexingBuilder:
+    """Обертка над представлением: каждый созданный узел добавляется в индекс (index.add)"""
+
+    def __init__(self, builder, index):
+        self.builder = builder
+        self.index = index
+        self.attach = builder.attach
+
+    def new(self, value, index):
+        self.index.add(value, index)
+        return self.builder.new(value, index)
+
+
+class _ArrayBuilder:
+    """Узел — индекс в заранее выделенном списке значений"""
+
+    def __init__(self, height):
+        self.values = [None] * ((1 << height) - 1)
+
+    def new(self, value, index):
+        self.values[index] = value
+        return index
+
+    def attach(self, parent, left, right):
+        pass
+
+
+# ------------------------------
+# Стратегии построения
+# ------------------------------
+def _build_recursive(builder, height, root, left_leaf, right_leaf):
+    new, attach = builder.new, builder.attach
+
+    def build(value, depth, index):
+        node = new(value, index)
+        if depth < height:
+            attach(
+                node,
+                build(left_leaf(value), depth + 1, 2 * index + 1),
+                build(right_leaf(value), depth + 1, 2 * index + 2)
+            )
+        return node
+
+    return build(root, 1, 0)
+
+
+def _build_bfs(builder, height, root, left_leaf, right_leaf):
+    new, attach = builder.new, builder.attach
+    root_node = new(root, 0)
+    queue = deque([(root_node, root, 1, 0)])
+
+    while queue:
+        node, value, depth, index = queue.popleft()
+        if depth >= height:
+            continue
+        left_value = left_leaf(value)
+        right_value = right_leaf(value)
+        left = new(left_value, 2 * index + 1)
+        right = new(right_value, 2 * index + 2)
+        attach(node, left, right)
+        queue.append((left, left_value, depth + 1, 2 * index + 1))
+        queue.append((right, right_value, depth + 1, 2 * index + 2))
+
+    return root_node
+
+
+def _build_dfs(builder, height, root, left_leaf, right_leaf):
+    new, attach = builder.new, builder.attach
+    root_node = new(root, 0)
+    stack = [(root_node, root, 1, 0)]
+
+    while stack:
+        node, value, depth, index = stack.pop()
+        if depth >= height:
+            continue
+        left_value = left_leaf(value)
+        right_value = right_leaf(value)
+        left = new(left_value, 2 * index + 1)
+        right = new(right_value, 2 * index + 2)
+        attach(node, left, right)
+        # Правый потомок кладется первым, чтобы левое поддерево обходилось раньше
+        stack.append((right, right_value, depth + 1, 2 * index + 2))
+        stack.append((left, left_value, depth + 1, 2 * index + 1))
+
+    return root_node
+
+
+def level_values(height, root, left_leaf, right_leaf):
+    """
+    Вычисляет значения дерева по уровням.
+
+    Значения уровня d+1 получаются применением left_leaf и right_leaf через map
+    ко всему уровню d и чередованием результатов (левый, правый, левый, ...).
+
+    Возвращает:
+        Список уровней; уровень — список значений слева направо
+    """
+    if height <= 0:
+        return []
+    levels = [[root]]
+    for _ in range(height - 1):
+        previous = levels[-1]
+        level = [None] * (2 * len(previous))
+        level[0::2] = map(left_leaf, previous)
+        level[1::2] = map(right_leaf, previous)
+        levels.append(level)
+    return levels
+
+
+def _build_level(builder, height, root, left_leaf, right_leaf):
+    levels = level_values(height, root, left_leaf, right_leaf)
+    if isinstance(builder, _ArrayBuilder):
+        position = 0
+        for level in levels:
+            builder.values[position:position + len(level)] = level
+            position += len(level)
+        return 0
+
+    new, attach = builder.new, builder.attach
+    # Сборка снизу вверх: потомки узла i уровня d — узлы 2i и 2i+1 уровня d+1;
+    # индекс в порядке уровней у узла i уровня d равен 2^d - 1 + i
+    depth = len(levels) - 1
+    children = [new(value, (1 << depth) - 1 + i) for i, value in enumerate(levels[-1])]
+    for level in reversed(levels[:-1]):
+        depth -= 1
+        nodes = [new(value, (1 << depth) - 1 + i) for i, value in enumerate(level)]
+        for i, node in enumerate(nodes):
+            attach(node, children[2 * i], children[2 * i + 1])
+        children = nodes
+    return children[0]
+
+
+_BUILDERS = {
+    'recursive': _build_recursive,
+    'bfs': _build_bfs,
+    'dfs': _build_dfs,
+    'level': _build_level,
+}
+
+
+def choose_strategy(height: int, output: str, left_leaf: Callable, right_leaf: Callable) -> str:
+    """
+    Выбирает стратегию построения.
+
+    Правила получены по benchmark_matrix:
+    - для массива выигрывает 'level' (значения уровня записываются срезом);
+    - если оба правила — встроенные функции, 'level' выигрывает на любой высоте,
+      так как map вызывает их без интерпретации байткода;
+    - для маленьких деревьев (высота до 6) с Python-правилами быстрее всего
+      'recursive': нет накладных расходов на очередь, стек и списки уровней;
+    - начиная с высоты ~8 выигрывает 'level' (на высоте 16 — на 20-30% для
+      словарей и TreeNode и в 2-5 раз для массива).
+    """
+    if output == 'array':
+        return 'level'
+    if isinstance(left_leaf, _BUILTIN_RULE_TYPES) and isinstance(right_leaf, _BUILTIN_RULE_TYPES):
+        return 'level'
+    if height <= 6:
+        return 'recursive'
+    return 'level'
+
+
+def generate_tree(
+    height: Optional[int] = None,
+    root: Optional[Any] = None,
+    left_leaf: Optional[Callable[[Any], Any]] = None,
+    right_leaf: Optional[Callable[[Any], Any]] = None,
+    strategy: str = 'auto',
+    output: str = 'dict',
+    index: Optional[Any] = None
+):
+    """
+    Генерирует бинарное дерево выбранной стратегией в выбранном представлении.
+
+    Аргументы:
+        height: Высота дерева (количество уровней)
+        root: Значение корневого узла
+        left_leaf: Функция для вычисления значения левого потомка из значения родителя
+        right_leaf: Функция для вычисления значения правого потомка из значения родителя
+        strategy: 'recursive', 'bfs', 'dfs', 'level' или 'auto'
+        output: 'dict', 'node' или 'array'
+        index: Индекс значений (например, tree_index.TreeIndex), заполняемый во время
+               генерации: для каждого узла вызывается index.add(значение, позиция в порядке уровней)
+
+    Возвращает:
+        Корень дерева (словарь или TreeNode) либо список значений в порядке уровней.
+        Для высоты 0 — None (для 'array' — пустой список).
+
+    Вызывает:
+        ValueError: Если высота отрицательная или стратегия/представление неизвестны
+        TypeError: Если left_leaf или right_leaf не являются вызываемыми объектами
+    """
+    height, root, left_leaf, right_leaf = resolve_params(height, root, left_leaf, right_leaf)
+    if output not in OUTPUTS:
+        raise ValueError(f"Неизвестное представление: {output}")
+    if strategy == 'auto':
+        strategy = choose_strategy(height, output, left_leaf, right_leaf)
+    if strategy not in _BUILDERS:
+        raise ValueError(f"Неизвестная стратегия: {strategy}")
+
+    if height == 0:
+        return [] if output == 'array' else None
+
+    if output == 'array':
+        builder = _ArrayBuilder(height)
+        _BUILDERS[strategy](builder, height, root, left_leaf, right_leaf)
+        if index is not None:
+            for position, value in enumerate(builder.values):
+                index.add(value, position)
+        return builder.values
+    builder = _DictBuilder if output == 'dict' else _NodeBuilder
+    if index is not None:
+        builder = _IndexingBuilder(builder, index)
+    return _BUILDERS[strategy](builder, height, root, left_leaf, right_leaf)
+
+
+def benchmark_matrix(heights=(4, 8, 12, 16), runs=5, left_leaf=None, right_leaf=None, root=1):
+    """
+    Замеряет все комбинации стратегия × представление для каждой высоты.
+
+    По умолчанию используются правила x + 1 и x * 2 (без роста больших чисел,
+    чтобы замерялась генерация, а не арифметика).
+
+    Возвращает:
+        Словарь {(высота, представление): {стратегия: среднее время в секундах}}
+    """
+    if left_leaf is None:
+        left_leaf = lambda x: x + 1
+    if right_leaf is None:
+        right_leaf = lambda x: x * 2
+
+    results = {}
+    for height in heights:
+        for output in OUTPUTS:
+            timings = {}
+            for strategy in STRATEGIES:
+                total = timeit.timeit(
+                    lambda: generate_tree(height, root, left_leaf, right_leaf, strategy, output),
+                    number=runs
+                )
+                timings[strategy] = total / runs
+            results[(height, output)] = timings
+    return results
+
+
+if __name__ == "__main__":
+    matrix = benchmark_matrix()
+    print(f"{'height':<8}{'output':<8}" + "".join(f"{s:<12}" for s in STRATEGIES) + "winner")
+    for (height, output), timings in matrix.items():
+        row = "".join(f"{timings[s] * 1000:<12.3f}" for s in STRATEGIES)
+        print(f"{height:<8}{output:<8}{row}{min(timings, key=timings.get)}")
+    print("(время в миллисекундах)")
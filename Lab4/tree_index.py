@@ -0,0 +1,186 @@
+"""
+Индекс «значение → позиции узлов» для сгенерированных бинарных деревьев.
+
+Позиция узла — его номер в порядке уровней (корень — 0, потомки узла i —
+2i+1 и 2i+2), путь — последовательность ключей 'left'/'right' от корня.
+Позиция однозначно задает путь, поэтому в индексе хранятся только позиции:
+одиночная позиция — целым числом, повторяющиеся — компактным массивом
+array('q') (8 байт на позицию вместо объекта int в списке).
+
+Индекс строится во время генерации (generate_tree(..., index=TreeIndex()))
+или позже по готовому дереву (TreeIndex.from_tree). Проверка наличия
+значения и получение его позиций — один поиск в словаре, O(1): позиции
+хранятся отсортированными (массив, пополненный не по порядку, например
+при обходе 'dfs', сортируется один раз при первом запросе) и
+возвращаются без копирования.
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, List, Tuple
+
+from tree_engine import generate_tree
+
+
+def position_to_path(position: int) -> Tuple[str, ...]:
+    """
+    Путь от корня до узла с данной позицией в порядке уровней.
+
+    Биты числа position + 1 после старшей единицы задают повороты: 0 — 'left', 1 — 'right'.
+    """
+    if position < 0:
+        raise ValueError("Позиция не может быть отрицательной")
+    bits = bin(position + 1)[3:]
+    return tuple('right' if bit == '1' else 'left' for bit in bits)
+
+
+def path_to_position(path: Iterable[str]) -> int:
+    """Позиция в порядке уровней для пути из ключей 'left'/'right'"""
+    number = 1
+    for step in path:
+        if step not in ('left', 'right'):
+            raise ValueError(f"Неизвестный шаг пути: {step}")
+        number = 2 * number + (step == 'right')
+    return number - 1
+
+
+def node_at(tree: Any, position: int) -> Any:
+    """
+    Узел дерева (словарь или TreeNode) по позиции в порядке уровней.
+
+    Вызывает:
+        IndexError: Если в дереве нет узла с такой позицией
+    """
+    node = tree
+    for step in position_to_path(position):
+        if node is None:
+            break
+        node = node[step] if isinstance(node, dict) else getattr(node, step)
+    if node is None:
+        raise IndexError(f"В дереве нет узла с позицией {position}")
+    return node
+
+
+class TreeIndex:
+    """
+    Индекс значений дерева.
+
+    Пример:
+        >>> index = TreeIndex()
+        >>> tree = generate_tree(4, 1, lambda x: x + 1, lambda x: x * 2, index=index)
+        >>> 4 in index
+        True
+        >>> index.positions(4)
+        array('q', [4, 6, 7, 11])
+        >>> index.paths(4)[0]
+        ('left', 'right')
+    """
+
+    __slots__ = ('_positions', '_unsorted', 'size')
+
+    def __init__(self):
+        # Значение -> позиция (int) или несколько позиций (array('q'))
+        self._positions: Dict[Any, Any] = {}
+        # Значения, массив позиций которых пополнен не по возрастанию
+        self._unsorted = set()
+        self.size = 0
+
+    def add(self, value: Any, position: int) -> None:
+        """Добавляет узел со значением value и позицией position"""
+        positions = self._positions
+        current = positions.get(value)
+        if current is None:
+            positions[value] = position
+        elif type(current) is int:
+            positions[value] = array('q', (current, position) if current < position else (position, current))
+        else:
+            if position < current[-1]:
+                self._unsorted.add(value)
+            current.append(position)
+        self.size += 1
+
+    @classmethod
+    def from_values(cls, values: Iterable[Any]) -> 'TreeIndex':
+        """Индекс по значениям в порядке уровней (результат generate_tree(output='array'))"""
+        index = cls()
+        for position, value in enumerate(values):
+            index.add(value, position)
+        return index
+
+    @classmethod
+    def from_tree(cls, tree: Any) -> 'TreeIndex':
+        """
+        Индекс по готовому дереву: словари gen_bin_tree, TreeNode или список в порядке уровней.
+
+        Обход итеративный (явный стек), лимит рекурсии не важен.
+        """
+        if isinstance(tree, list):
+            return cls.from_values(tree)
+        index = cls()
+        stack = [(tree, 0)] if tree is not None else []
+        while stack:
+            node, position = stack.pop()
+            if isinstance(node, dict):
+                value, left, right = node['value'], node['left'], node['right']
+            else:
+                value, left, right = node.value, node.left, node.right
+            index.add(value, position)
+            if right is not None:
+                stack.append((right, 2 * position + 2))
+            if left is not None:
+                stack.append((left, 2 * position + 1))
+        return index
+
+    @classmethod
+    def generate(cls, *args, **kwargs) -> Tuple[Any, 'TreeIndex']:
+        """
+        Генерирует дерево через generate_tree и одновременно строит индекс.
+
+        Возвращает:
+            Кортеж (дерево, индекс)
+        """
+        index = cls()
+        return generate_tree(*args, index=index, **kwargs), index
+
+    def __contains__(self, value: Any) -> bool:
+        return value in self._positions
+
+    def __len__(self) -> int:
+        """Количество различных значений"""
+        return len(self._positions)
+
+    def count(self, value: Any) -> int:
+        """Сколько раз значение встречается в дереве"""
+        current = self._positions.get(value)
+        if current is None:
+            return 0
+        return 1 if type(current) is int else len(current)
+
+    def positions(self, value: Any) -> array:
+        """
+        Позиции узлов со значением value по возрастанию (пустой массив, если значения нет).
+
+        Для повторяющегося значения возвращается хранимый массив без копирования —
+        его нельзя изменять.
+        """
+        current = self._positions.get(value)
+        if current is None:
+            return array('q')
+        if type(current) is int:
+            return array('q', (current,))
+        if value in self._unsorted:
+            current = self._positions[value] = array('q', sorted(current))
+            self._unsorted.discard(value)
+        return current
+
+    def paths(self, value: Any) -> List[Tuple[str, ...]]:
+        """Пути от корня до узлов со значением value"""
+        return [position_to_path(position) for position in self.positions(value)]
+
+    def lookup_many(self, values: Iterable[Any]) -> Dict[Any, array]:
+        """Позиции для набора значений: {значение: array('q')}; отсутствующие дают пустой массив"""
+        return {value: self.positions(value) for value in values}
+
+    def contains_many(self, values: Iterable[Any]) -> List[bool]:
+        """Наличие каждого значения из набора"""
+        positions = self._positions
+        return [value in positions for value in values]
@@ -0,0 +1,187 @@
+"""
+Потоковая генерация бинарных деревьев без построения дерева в памяти.
+
+Значения узлов выдаются кортежами (depth, position, value) по мере
+вычисления или сразу передаются в агрегаторы (суммы и максимумы по уровням,
+список листьев, гистограмма значений). Глубина корня — 0, position — номер
+узла на уровне слева направо (потомки узла p — 2p и 2p+1 следующего уровня).
+
+Порядки обхода:
+    'dfs'   — в глубину (прямой порядок), в памяти стек из O(высоты) элементов
+    'level' — по уровням, в памяти только текущий и следующий уровень (O(ширины))
+"""
+
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from tree_engine import resolve_params
+
+
+ORDERS = ('dfs', 'level')
+
+
+def _iter_dfs(height, root, left_leaf, right_leaf):
+    # На стеке не больше одного отложенного правого потомка на каждом уровне
+    stack = [(0, 0, root)]
+    while stack:
+        depth, position, value = stack.pop()
+        yield depth, position, value
+        if depth + 1 < height:
+            stack.append((depth + 1, 2 * position + 1, right_leaf(value)))
+            stack.append((depth + 1, 2 * position, left_leaf(value)))
+
+
+def _iter_level(height, root, left_leaf, right_leaf):
+    level = [root]
+    for depth in range(height):
+        yield from ((depth, position, value) for position, value in enumerate(level))
+        if depth + 1 < height:
+            # Следующий уровень вычисляется через map, как в tree_engine.level_values,
+            # но предыдущие уровни не сохраняются
+            following = [None] * (2 * len(level))
+            following[0::2] = map(left_leaf, level)
+            following[1::2] = map(right_leaf, level)
+            level = following
+
+
+_ITERATORS = {
+    'dfs': _iter_dfs,
+    'level': _iter_level,
+}
+
+
+def iter_tree(
+    height: Optional[int] = None,
+    root: Optional[Any] = None,
+    left_leaf: Optional[Callable[[Any], Any]] = None,
+    right_leaf: Optional[Callable[[Any], Any]] = None,
+    order: str = 'dfs'
+) -> Iterator[Tuple[int, int, Any]]:
+    """
+    Генерирует значения узлов дерева по мере вычисления, не строя само дерево.
+
+    Параметры по умолчанию те же, что у gen_bin_tree (вариант 12).
+
+    Аргументы:
+        height: Высота дерева (количество уровней)
+        root: Значение корневого узла
+        left_leaf: Функция для вычисления значения левого потомка из значения родителя
+        right_leaf: Функция для вычисления значения правого потомка из значения родителя
+        order: 'dfs' (память O(высоты)) или 'level' (память O(ширины уровня))
+
+    Возвращает:
+        Итератор кортежей (depth, position, value)
+
+    Вызывает:
+        ValueError: Если высота отрицательная или порядок обхода неизвестен
+        TypeError: Если left_leaf или right_leaf не являются вызываемыми объектами
+    """
+    height, root, left_leaf, right_leaf = resolve_params(height, root, left_leaf, right_leaf)
+    if order not in _ITERATORS:
+        raise ValueError(f"Неизвестный порядок обхода: {order}")
+    if height == 0:
+        return iter(())
+    return _ITERATORS[order](height, root, left_leaf, right_leaf)
+
+
+# ------------------------------
+# Агрегаторы
+# ------------------------------
+# Агрегатор — любой объект с методами add(depth, position, value) и result()
+
+class LevelSums:
+    """Сумма значений на каждом уровне: список, индекс — глубина"""
+
+    def __init__(self):
+        self.sums = []
+
+    def add(self, depth, position, value):
+        if depth == len(self.sums):
+            self.sums.append(value)
+        else:
+            self.sums[depth] += value
+
+    def result(self):
+        return self.sums
+
+
+class LevelMax:
+    """Максимальное значение на каждом уровне: список, индекс — глубина"""
+
+    def __init__(self):
+        self.maxima = []
+
+    def add(self, depth, position, value):
+        if depth == len(self.maxima):
+            self.maxima.append(value)
+        elif value > self.maxima[depth]:
+            self.maxima[depth] = value
+
+    def result(self):
+        return self.maxima
+
+
+class Leaves:
+    """
+    Значения листьев (узлов последнего уровня) в порядке обхода.
+
+    Высота заранее не известна: список сбрасывается, когда встречается более глубокий уровень.
+    """
+
+    def __init__(self):
+        self.depth = -1
+        self.values = []
+
+    def add(self, depth, position, value):
+        if depth > self.depth:
+            self.depth = depth
+            self.values = []
+        if depth == self.depth:
+            self.values.append(value)
+
+    def result(self):
+        return self.values
+
+
+class Histogram:
+    """Гистограмма значений; key — функция группировки (например, int.bit_length для больших чисел)"""
+
+    def __init__(self, key: Optional[Callable[[Any], Any]] = None):
+        self.key = key
+        self.counts = Counter()
+
+    def add(self, depth, position, value):
+        self.counts[value if self.key is None else self.key(value)] += 1
+
+    def result(self):
+        return dict(self.counts)
+
+
+def fold_tree(
+    reducers: Dict[str, Any],
+    height: Optional[int] = None,
+    root: Optional[Any] = None,
+    left_leaf: Optional[Callable[[Any], Any]] = None,
+    right_leaf: Optional[Callable[[Any], Any]] = None,
+    order: str = 'dfs'
+) -> Dict[str, Any]:
+    """
+    Генерирует дерево потоком и передает каждое значение во все агрегаторы.
+
+    Пример:
+        >>> fold_tree({'sums': LevelSums(), 'leaves': Leaves()}, height=3, root=1,
+        ...           left_leaf=lambda x: x + 1, right_leaf=lambda x: x * 2)
+        {'sums': [1, 4, 14], 'leaves': [3, 4, 3, 4]}
+
+    Аргументы:
+        reducers: Словарь {имя: агрегатор}
+        height, root, left_leaf, right_leaf, order: См. iter_tree
+
+    Возвращает:
+        Словарь {имя: результат агрегатора}
+    """
+    adders = [reducer.add for reducer in reducers.values()]
+    for depth, position, value in iter_tree(height, root, left_leaf, right_leaf, order):
+        for add in adders:
+            add(depth, position, value)
+    return {name: reducer.result() for name, reducer in reducers.items()}
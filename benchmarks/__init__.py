@@ -0,0 +1,10 @@
+"""
+Единый набор замеров производительности для всех лабораторных работ.
+
+Запуск из корня репозитория:
+    python -m benchmarks                  # все наборы, JSON в stdout
+    python -m benchmarks --quick          # быстрый режим (меньше размеров и замеров)
+    python -m benchmarks --suite trees --output bench.json
+"""
+
+from benchmarks.runner import SUITES, measure, run
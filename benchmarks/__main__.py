@@ -0,0 +1,40 @@
+"""
+Точка входа: python -m benchmarks [--quick] [--suite ИМЯ ...] [--output ФАЙЛ]
+
+Отчет выводится в формате JSON (см. benchmarks.runner.run); ход выполнения —
+в stderr, чтобы stdout можно было перенаправить в файл или другую программу.
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.runner import SUITES, run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Замеры производительности всех лабораторных работ")
+    parser.add_argument('--quick', action='store_true', help="Быстрый режим: меньше размеров и замеров")
+    parser.add_argument('--suite', action='append', choices=list(SUITES),
+                        help="Набор замеров (можно указать несколько раз; по умолчанию все)")
+    parser.add_argument('--min-time', type=float, help="Минимальная длительность одного замера, с")
+    parser.add_argument('--repeat', type=int, help="Количество замеров каждого случая")
+    parser.add_argument('--output', help="Файл для отчета (по умолчанию stdout)")
+    parser.add_argument('--quiet', action='store_true', help="Не выводить ход выполнения в stderr")
+    args = parser.parse_args(argv)
+
+    progress = None if args.quiet else (lambda text: print(text, file=sys.stderr))
+    report = run(args.suite, quick=args.quick, min_time=args.min_time, repeat=args.repeat, progress=progress)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Загрузка модулей лабораторных работ.
+
+Каждая лабораторная — отдельная директория со своим main.py, поэтому модули
+загружаются по пути к файлу под уникальными именами (lab2_main, lab4_main, ...).
+На время загрузки директория лабораторной добавляется в sys.path, чтобы
+работали импорты соседних модулей (from tree_engine import ..., from metrics import ...).
+"""
+
+import importlib.util
+import os
+import sys
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_loaded = {}
+
+
+def load_lab(lab, module='main'):
+    """
+    Загружает модуль лабораторной работы (повторные вызовы возвращают тот же модуль)
+
+    Args:
+        lab (str): Имя директории лабораторной (например, 'Lab2' или 'lab6')
+        module (str): Имя модуля в директории без .py
+
+    Returns:
+        module: Загруженный модуль
+
+    Raises:
+        FileNotFoundError: Если файла модуля нет
+        ImportError: Если не установлена зависимость модуля (например, requests для lab6)
+    """
+    name = f'{lab.lower()}_{module}'
+    if name in _loaded:
+        return _loaded[name]
+
+    directory = os.path.join(REPO_ROOT, lab)
+    path = os.path.join(directory, f'{module}.py')
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    loaded = importlib.util.module_from_spec(spec)
+    sys.path.insert(0, directory)
+    try:
+        # Модуль регистрируется до выполнения, как при обычном import
+        sys.modules[name] = loaded
+        try:
+            spec.loader.exec_module(loaded)
+        except BaseException:
+            del sys.modules[name]
+            raise
+    finally:
+        sys.path.remove(directory)
+    _loaded[name] = loaded
+    return loaded
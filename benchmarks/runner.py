@@ -0,0 +1,212 @@
+"""
+Наборы замеров для всех лабораторных работ и сборка машиночитаемого отчета.
+
+Набор (suite) — функция suite(quick) -> список случаев (lab, name, params, func):
+func — функция без аргументов, время вызова которой замеряется. Для каждого
+случая количество вызовов в одном замере подбирается так, чтобы замер длился
+не меньше min_time, затем замер повторяется repeat раз.
+"""
+
+import os
+import platform
+import time
+from datetime import datetime, timezone
+
+from benchmarks.labs import load_lab
+
+
+# Правила генерации деревьев без роста больших чисел (замеряется генерация, а не арифметика)
+TREE_ROOT = 1
+TREE_LEFT = lambda x: x + 1
+TREE_RIGHT = lambda x: x * 2
+
+# Параметры полного и быстрого режимов
+SIZES = {
+    'two_sum': {'full': (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6), 'quick': (10 ** 3, 10 ** 4)},
+    'trees': {'full': (4, 8, 12, 16), 'quick': (4, 8)},
+    'factorials': {'full': (10, 100, 500), 'quick': (10, 100)},
+    'currencies': {'full': (1, 10), 'quick': (1,)},
+}
+MIN_TIME = {'full': 0.2, 'quick': 0.02}
+REPEAT = {'full': 5, 'quick': 3}
+
+
+def measure(func, min_time=0.2, repeat=5):
+    """
+    Замер времени одного вызова функции
+
+    Args:
+        func (Callable): Функция без аргументов
+        min_time (float): Минимальная длительность одного замера, с
+        repeat (int): Количество замеров
+
+    Returns:
+        dict: number — вызовов в замере, repeat — замеров, best/median/mean — время одного вызова, с
+    """
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        # Оценка нужного количества вызовов с запасом, но не больше чем в 10 раз за шаг
+        number = min(number * 10, max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.2)))
+
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) / number)
+    samples.sort()
+    return {
+        'number': number,
+        'repeat': repeat,
+        'best': samples[0],
+        'median': samples[len(samples) // 2],
+        'mean': sum(samples) / len(samples),
+    }
+
+
+# ------------------------------
+# Наборы замеров
+# ------------------------------
+class _Cases(list):
+    """Список случаев с необязательной функцией освобождения ресурсов (cleanup)"""
+    cleanup = None
+
+
+def suite_two_sum(quick=False):
+    """Lab2: two_sum на худшем случае (пара — два последних элемента)"""
+    lab2 = load_lab('Lab2')
+    cases = []
+    for n in SIZES['two_sum']['quick' if quick else 'full']:
+        nums = list(range(n))
+        target = 2 * n - 3
+        cases.append(('Lab2', 'two_sum', {'n': n}, lambda nums=nums, target=target: lab2.two_sum(nums, target)))
+    return cases
+
+
+def suite_trees(quick=False):
+    """Lab3/Lab4: генерация деревьев обеими реализациями gen_bin_tree, tree_to_list, get_tree_height"""
+    lab3 = load_lab('Lab3')
+    lab4 = load_lab('Lab4')
+    cases = []
+    for height in SIZES['trees']['quick' if quick else 'full']:
+        params = {'height': height}
+        args = (height, TREE_ROOT, TREE_LEFT, TREE_RIGHT)
+        tree = lab4.gen_bin_tree(*args)
+        cases += [
+            ('Lab3', 'gen_bin_tree', params, lambda args=args: lab3.gen_bin_tree(*args)),
+            ('Lab4', 'gen_bin_tree', params, lambda args=args: lab4.gen_bin_tree(*args)),
+            ('Lab4', 'gen_bin_tree_class', params, lambda args=args: lab4.gen_bin_tree_class(*args)),
+            ('Lab4', 'tree_to_list', params, lambda tree=tree: lab4.tree_to_list(tree)),
+            ('Lab4', 'get_tree_height', params, lambda tree=tree: lab4.get_tree_height(tree)),
+        ]
+    return cases
+
+
+def suite_factorials(quick=False):
+    """lab5: точные и приближенные реализации факториала"""
+    lab5 = load_lab('lab5')
+    cases = []
+    for n in SIZES['factorials']['quick' if quick else 'full']:
+        for func in lab5.BENCHMARK_FUNCTIONS + lab5.APPROXIMATE_FUNCTIONS:
+            cases.append(('lab5', func.__name__, {'n': n}, lambda func=func, n=n: func(n)))
+    return cases
+
+
+def suite_currencies(quick=False):
+    """lab6: get_currencies против локального имитатора API ЦБ РФ (без кэша, частичный разбор, с кэшем)"""
+    lab6 = load_lab('lab6')
+    mock_server = load_lab('lab6', 'mock_server')
+    server = mock_server.MockCBRServer().start()
+    session = lab6.create_session(retries=0)
+
+    def get(codes, **kwargs):
+        if lab6.get_currencies(codes, url=server.url, session=session, **kwargs) is None:
+            raise RuntimeError("get_currencies вернула None (ошибка запроса к имитатору)")
+
+    codes_all = sorted(mock_server.load_payload()['Valute'])
+    cases = _Cases()
+    for count in SIZES['currencies']['quick' if quick else 'full']:
+        codes = codes_all[:count]
+        params = {'codes': count}
+        cache = lab6.RatesCache()
+        cases += [
+            ('lab6', 'get_currencies', params, lambda codes=codes: get(codes)),
+            ('lab6', 'get_currencies_partial', params, lambda codes=codes: get(codes, partial=True)),
+            ('lab6', 'get_currencies_cached', params, lambda codes=codes, cache=cache: get(codes, cache=cache)),
+        ]
+    # Сервер и сессия закрываются после замера всех случаев (см. run)
+    cases.cleanup = lambda: (session.close(), server.stop())
+    return cases
+
+
+SUITES = {
+    'two_sum': suite_two_sum,
+    'trees': suite_trees,
+    'factorials': suite_factorials,
+    'currencies': suite_currencies,
+}
+
+
+def run(suites=None, quick=False, min_time=None, repeat=None, progress=None):
+    """
+    Выполняет наборы замеров и собирает отчет
+
+    Args:
+        suites (list): Имена наборов из SUITES (по умолчанию все)
+        quick (bool): Быстрый режим: меньше размеров, короче и меньше замеров
+        min_time (float): Минимальная длительность одного замера (по умолчанию по режиму)
+        repeat (int): Количество замеров (по умолчанию по режиму)
+        progress (Callable): Вызывается с текстом перед каждым случаем (например, вывод в stderr)
+
+    Returns:
+        dict: Отчет: meta — окружение и режим, results — замеры, skipped — пропущенные наборы
+              (например, если не установлена зависимость лабораторной)
+    """
+    mode = 'quick' if quick else 'full'
+    min_time = MIN_TIME[mode] if min_time is None else min_time
+    repeat = REPEAT[mode] if repeat is None else repeat
+    names = list(SUITES) if suites is None else list(suites)
+    unknown = [name for name in names if name not in SUITES]
+    if unknown:
+        raise ValueError(f"Неизвестные наборы: {', '.join(unknown)}")
+
+    report = {
+        'meta': {
+            'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'mode': mode,
+            'min_time': min_time,
+            'repeat': repeat,
+            'unit': 'seconds per call',
+        },
+        'results': [],
+        'skipped': [],
+    }
+    for name in names:
+        try:
+            cases = SUITES[name](quick)
+        except ImportError as e:
+            report['skipped'].append({'suite': name, 'reason': str(e)})
+            continue
+        cleanup = getattr(cases, 'cleanup', None)
+        try:
+            for lab, case, params, func in cases:
+                if progress is not None:
+                    progress(f"{name}: {lab}.{case} {params}")
+                report['results'].append({
+                    'suite': name, 'lab': lab, 'name': case, 'params': params,
+                    **measure(func, min_time, repeat),
+                })
+        finally:
+            if cleanup is not None:
+                cleanup()
+    return report
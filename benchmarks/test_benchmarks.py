@@ -0,0 +1,79 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from benchmarks.labs import load_lab
+from benchmarks.runner import SUITES, measure, run
+from benchmarks.__main__ import main
+
+
+class TestLabLoading(unittest.TestCase):
+    """Загрузка модулей лабораторных с одинаковыми именами main.py"""
+
+    def test_labs_do_not_collide(self):
+        """main.py разных лабораторных загружаются как разные модули"""
+        lab2 = load_lab('Lab2')
+        lab4 = load_lab('Lab4')
+        self.assertIsNot(lab2, lab4)
+        self.assertTrue(hasattr(lab2, 'two_sum'))
+        self.assertTrue(hasattr(lab4, 'gen_bin_tree'))
+        self.assertIs(load_lab('Lab2'), lab2)
+
+    def test_missing_module(self):
+        with self.assertRaises(FileNotFoundError):
+            load_lab('Lab2', 'no_such_module')
+
+
+class TestRunner(unittest.TestCase):
+    """Формат отчета и работа наборов замеров"""
+
+    def test_measure(self):
+        calls = []
+        stats = measure(lambda: calls.append(1), min_time=0.001, repeat=3)
+        self.assertEqual(stats['repeat'], 3)
+        self.assertLessEqual(stats['best'], stats['median'])
+        self.assertGreaterEqual(len(calls), 3 * stats['number'])
+
+    def test_quick_report(self):
+        """Каждый набор дает замеры или явную причину пропуска"""
+        report = run(quick=True, min_time=0.001, repeat=1)
+        json.dumps(report)  # Отчет сериализуется в JSON
+        self.assertEqual(report['meta']['mode'], 'quick')
+        covered = {item['suite'] for item in report['results']} | {item['suite'] for item in report['skipped']}
+        self.assertEqual(covered, set(SUITES))
+        names = {(item['lab'], item['name']) for item in report['results']}
+        self.assertIn(('Lab2', 'two_sum'), names)
+        self.assertIn(('Lab3', 'gen_bin_tree'), names)
+        self.assertIn(('Lab4', 'tree_to_list'), names)
+        self.assertIn(('lab5', 'fact_iterative'), names)
+        for item in report['results']:
+            self.assertGreater(item['best'], 0)
+
+    def test_unknown_suite(self):
+        with self.assertRaises(ValueError):
+            run(['no_such_suite'])
+
+
+class TestCommandLine(unittest.TestCase):
+    """Точка входа python -m benchmarks"""
+
+    def test_json_output(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bench.json')
+            main(['--quick', '--quiet', '--suite', 'two_sum', '--min-time', '0.001', '--output', path])
+            with open(path, encoding='utf-8') as f:
+                report = json.load(f)
+        self.assertEqual({item['name'] for item in report['results']}, {'two_sum'})
+
+    def test_stdout(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            main(['--quick', '--quiet', '--suite', 'factorials', '--min-time', '0.001', '--repeat', '1'])
+        self.assertEqual(json.loads(out.getvalue())['meta']['repeat'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
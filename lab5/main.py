@@ -1,5 +1,9 @@
+import math
+import operator
+import os
+import sys
 import timeit
-import matplotlib.pyplot as plt
+import tracemalloc
 
 
 # ------------------------------
@@ -85,6 +89,275 @@ def fact_iterative_memo(n):
     return result
 
 
+# ------------------------------
+# Параллельный факториал для больших n (дерево произведений в пуле процессов)
+# ------------------------------
+# Ниже этого n накладные расходы на процессы и передачу чисел превышают выигрыш
+PARALLEL_FACTORIAL_THRESHOLD = 20000
+
+
+def _range_product(lo, hi):
+    """
+    Произведение lo * (lo + 1) * ... * hi сбалансированным деревом
+    (перемножаются множители близкого размера, что быстрее последовательного умножения)
+    :return: Произведение (1 для пустого диапазона lo > hi)
+    """
+    if lo > hi:
+        return 1
+    if hi - lo < 16:
+        return math.prod(range(lo, hi + 1))
+    mid = (lo + hi) // 2
+    return _range_product(lo, mid) * _range_product(mid + 1, hi)
+
+
+def _range_product_task(bounds):
+    """Задача для пула процессов: произведение одного блока (lo, hi)"""
+    return _range_product(*bounds)
+
+
+def _balanced_chunks(n, chunks):
+    """
+    Разбиение 1..n на блоки с примерно равной суммарной длиной множителей
+    Размер произведения блока пропорционален сумме log(k), поэтому границы подбираются
+    бинарным поиском по log(k!) = lgamma(k + 1): блоки в начале диапазона длиннее, в конце короче
+    :param n: Верхняя граница диапазона
+    :param chunks: Желаемое количество блоков
+    :return: Список непустых блоков (lo, hi)
+    """
+    total = math.lgamma(n + 1)
+    bounds = [1]
+    for i in range(1, chunks):
+        target = total * i / chunks
+        lo, hi = bounds[-1], n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if math.lgamma(mid + 1) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        bounds.append(lo)
+    bounds.append(n + 1)
+    return [(bounds[i], bounds[i + 1] - 1) for i in range(chunks) if bounds[i] < bounds[i + 1]]
+
+
+def fact_parallel(n, workers=None, threshold=PARALLEL_FACTORIAL_THRESHOLD, executor=None):
+    """
+    Параллельный факториал: дерево произведений в пуле процессов
+    Диапазон 1..n делится на сбалансированные блоки, блоки перемножаются в процессах пула,
+    затем частичные произведения попарно объединяются (сбалансированным деревом): пока пар много,
+    умножения выполняются в пуле, последнее умножение — в текущем процессе
+    :param n: Неотрицательное целое число — основание факториала
+    :param workers: Количество процессов (по умолчанию — число доступных ядер)
+    :param threshold: При n меньше порога (или одном процессе) пул не используется
+    :param executor: Готовый ProcessPoolExecutor (например, для повторных замеров без запуска процессов)
+    :return: Результат вычисления факториала n
+    :raises ValueError: Если n является отрицательным числом
+    """
+    if n < 0:
+        raise ValueError("n должно быть неотрицательным целым числом")
+    if workers is None:
+        workers = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    if n < threshold or workers <= 1:
+        return _range_product(1, n)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Блоков больше, чем процессов: освободившийся процесс берет следующий блок
+    chunks = _balanced_chunks(n, workers * 4)
+    pool = executor if executor is not None else ProcessPoolExecutor(max_workers=workers)
+    try:
+        parts = list(pool.map(_range_product_task, chunks))
+        # Попарное объединение соседних произведений (блоки идут по порядку и близки по размеру)
+        while len(parts) > 2:
+            pairs = pool.map(operator.mul, parts[0::2], parts[1::2])
+            parts = list(pairs) + ([parts[-1]] if len(parts) % 2 else [])
+    finally:
+        if executor is None:
+            pool.shutdown()
+    return math.prod(parts)
+
+
+def benchmark_parallel_factorial(n=10 ** 6, worker_counts=(1, 2, 4), runs=1):
+    """
+    Сравнение fact_parallel с разным количеством процессов и math.factorial
+    Пул создается и прогревается до замера, поэтому в время входят только вычисления
+    и передача частичных произведений между процессами
+    :param n: Основание факториала
+    :param worker_counts: Количества процессов для замера
+    :param runs: Количество запусков для каждого варианта
+    :return: Словарь {"math.factorial": время, количество процессов: время, ...} (среднее, секунды)
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    expected = math.factorial(n)
+    results = {"math.factorial": timeit.timeit(lambda: math.factorial(n), number=runs) / runs}
+    for workers in worker_counts:
+        if workers <= 1:
+            results[workers] = timeit.timeit(lambda: fact_parallel(n, workers=1), number=runs) / runs
+            continue
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Прогрев: запуск всех процессов пула до замера
+            list(pool.map(abs, range(workers)))
+            if fact_parallel(n, workers, threshold=0, executor=pool) != expected:
+                raise AssertionError(f"fact_parallel({n}) с {workers} процессами дал неверный результат")
+            results[workers] = timeit.timeit(
+                lambda: fact_parallel(n, workers, threshold=0, executor=pool), number=runs
+            ) / runs
+    return results
+
+
+def print_parallel_results(results, n):
+    """
+    Вывод результатов benchmark_parallel_factorial
+    :param results: Результаты benchmark_parallel_factorial
+    :param n: Основание факториала
+    """
+    baseline = results["math.factorial"]
+    print("\n" + "="*80)
+    print(f"Параллельный факториал, n = {n} (ядер доступно: {os.cpu_count()})")
+    print("="*80)
+    print(f"{'вариант':<22}{'время, с':<16}{'относительно math.factorial':<16}")
+    print("-"*80)
+    for name, elapsed in results.items():
+        label = name if isinstance(name, str) else f"fact_parallel x{name}"
+        print(f"{label:<22}{elapsed:<16.4f}{baseline / elapsed:<16.2f}")
+
+
+# ------------------------------
+# Приближенные величины без построения большого целого числа
+# ------------------------------
+# Коэффициенты ряда Стирлинга B_2k / (2k(2k - 1)) для ln(n!) - (n ln n - n + ln(2πn) / 2)
+STIRLING_COEFFICIENTS = (1 / 12, -1 / 360, 1 / 1260, -1 / 1680, 1 / 1188, -691 / 360360, 1 / 156)
+
+# До этого n log_factorial_array берет значения из таблицы math.lgamma, дальше — ряд Стирлинга
+_LOG_FACTORIAL_TABLE_SIZE = 256
+# Таблица ln(k!) для k < _LOG_FACTORIAL_TABLE_SIZE; строится один раз при первом вызове
+# log_factorial_array, чтобы NumPy оставался необязательным импортом
+_log_factorial_table = None
+
+
+def log_factorial(n):
+    """
+    Натуральный логарифм факториала через math.lgamma: ln(n!) = lgamma(n + 1)
+    :param n: Неотрицательное целое число — основание факториала
+    :return: ln(n!) (float)
+    :raises ValueError: Если n является отрицательным числом
+    """
+    if n < 0:
+        raise ValueError("n должно быть неотрицательным целым числом")
+    return math.lgamma(n + 1)
+
+
+def log_factorial_array(values):
+    """
+    Векторизованный ln(n!) для массива n (NumPy)
+    Для n < 256 значения берутся из таблицы, посчитанной math.lgamma при первом вызове, для больших n —
+    ряд Стирлинга с тремя поправочными членами (погрешность ряда меньше округления float64)
+    Без NumPy вычисляется поэлементно через log_factorial и возвращается список
+    :param values: Последовательность или массив неотрицательных целых чисел
+    :return: numpy.ndarray из float64 (или список float без NumPy)
+    :raises ValueError: Если среди значений есть отрицательные
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return [log_factorial(n) for n in values]
+
+    n = np.asarray(values, dtype=np.int64)
+    if n.size and n.min() < 0:
+        raise ValueError("n должно быть неотрицательным целым числом")
+    global _log_factorial_table
+    if _log_factorial_table is None:
+        _log_factorial_table = np.array([math.lgamma(k + 1) for k in range(_LOG_FACTORIAL_TABLE_SIZE)])
+    table = _log_factorial_table
+    small = n < _LOG_FACTORIAL_TABLE_SIZE
+    result = np.empty(n.shape, dtype=np.float64)
+    result[small] = table[n[small]]
+    large = n[~small].astype(np.float64)
+    inverse = 1.0 / large
+    inverse_sq = inverse * inverse
+    correction = inverse * (STIRLING_COEFFICIENTS[0] + inverse_sq * (STIRLING_COEFFICIENTS[1] + inverse_sq * STIRLING_COEFFICIENTS[2]))
+    result[~small] = large * np.log(large) - large + 0.5 * np.log(2 * math.pi * large) + correction
+    return result
+
+
+def factorial_digits(n):
+    """
+    Количество десятичных цифр n! по логарифму: floor(log10(n!)) + 1
+    :param n: Неотрицательное целое число — основание факториала
+    :return: Количество цифр (int)
+    :raises ValueError: Если n является отрицательным числом
+    """
+    if n < 0:
+        raise ValueError("n должно быть неотрицательным целым числом")
+    if n < 2:
+        return 1
+    return math.floor(math.lgamma(n + 1) / math.log(10)) + 1
+
+
+def factorial_trailing_zeros(n):
+    """
+    Количество нулей в конце n! по формуле Лежандра: n // 5 + n // 25 + n // 125 + ...
+    (множителей 2 всегда больше, чем множителей 5)
+    :param n: Неотрицательное целое число — основание факториала
+    :return: Количество нулей (int)
+    :raises ValueError: Если n является отрицательным числом
+    """
+    if n < 0:
+        raise ValueError("n должно быть неотрицательным целым числом")
+    zeros = 0
+    while n:
+        n //= 5
+        zeros += n
+    return zeros
+
+
+def stirling_log_factorial(n, terms=3):
+    """
+    Приближение ln(n!) рядом Стирлинга с оценкой погрешности
+    ln(n!) ≈ n ln n - n + ln(2πn) / 2 + Σ B_2k / (2k(2k - 1) n^(2k - 1))
+    Ряд знакочередующийся и обрамляющий: погрешность по модулю не больше первого отброшенного члена
+    :param n: Неотрицательное целое число — основание факториала
+    :param terms: Количество поправочных членов ряда (от 0 до 6)
+    :return: Кортеж (приближение ln(n!), граница абсолютной погрешности)
+    :raises ValueError: Если n является отрицательным числом или terms вне диапазона
+    """
+    if n < 0:
+        raise ValueError("n должно быть неотрицательным целым числом")
+    if not 0 <= terms < len(STIRLING_COEFFICIENTS):
+        raise ValueError(f"terms должно быть от 0 до {len(STIRLING_COEFFICIENTS) - 1}")
+    if n == 0:
+        return 0.0, 0.0
+    value = n * math.log(n) - n + 0.5 * math.log(2 * math.pi * n)
+    for k in range(terms):
+        value += STIRLING_COEFFICIENTS[k] / n ** (2 * k + 1)
+    bound = abs(STIRLING_COEFFICIENTS[terms]) / n ** (2 * terms + 1)
+    return value, bound
+
+
+def stirling_factorial(n, terms=3):
+    """
+    Приближение n! рядом Стирлинга (см. stirling_log_factorial)
+    :param n: Неотрицательное целое число (n! должен помещаться в float, т.е. n <= 170)
+    :param terms: Количество поправочных членов ряда
+    :return: Кортеж (приближение n!, граница относительной погрешности)
+    :raises OverflowError: Если n! не помещается в float
+    """
+    value, bound = stirling_log_factorial(n, terms)
+    return math.exp(value), math.expm1(bound)
+
+
+# Список тестируемых функций (порядок определяет порядок столбцов в таблице и на графике)
+BENCHMARK_FUNCTIONS = [fact_recursive, fact_iterative, fact_recursive_memo, fact_iterative_memo]
+
+# Приближенные функции (run_benchmark(approximate=True)) — замеряются рядом с точными
+APPROXIMATE_FUNCTIONS = [log_factorial, factorial_digits, factorial_trailing_zeros, stirling_log_factorial]
+
+# Долгоживущие кэши функций (у fact_recursive_memo кэш локальный и живет только во время вызова,
+# его объем учитывается в пиковой памяти tracemalloc)
+FUNCTION_CACHES = {"fact_iterative_memo": fact_iter_memo_cache}
+
+
 # ------------------------------
 # Вспомогательные функции для бенчмаркинга
 # ------------------------------
@@ -98,13 +371,54 @@ def get_average_time(func, n, runs=100):
     """
     # Формирование строки для выполнения через timeit (гарантируем независимость вызовов)
     stmt = f"{func.__name__}({n})"
-    # Формирование строки для инициализации окружения (импортируем тестируемую функцию)
-    setup = f"from __main__ import {func.__name__}"
+    # Тестируемая функция передается через globals, поэтому замер работает
+    # не только из __main__, но и в дочерних процессах пула
+    namespace = {func.__name__: func}
     # Вычисление общего времени и возврат среднего значения
-    total_time = timeit.timeit(stmt=stmt, setup=setup, number=runs)
+    total_time = timeit.timeit(stmt=stmt, number=runs, globals=namespace)
     return total_time / runs
 
 
+def get_memory_usage(func, n):
+    """
+    Профилирование памяти одного вызова функции через tracemalloc
+    :param func: Тестируемая функция
+    :param n: Входной параметр для функции
+    :return: Словарь: peak — пиковый прирост памяти во время вызова (байты),
+             retained_blocks — прирост числа выделенных блоков после вызова (блоки,
+             выделенные и освобожденные во время вызова, не учитываются),
+             cache_entries / cache_bytes — размер долгоживущего кэша функции после вызова
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = func(n)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    del result
+
+    # Разница снимков: сколько блоков осталось выделенными (например, новые записи кэша);
+    # собственные выделения tracemalloc исключаются фильтром
+    own_traces = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    before = before.filter_traces(own_traces)
+    after = after.filter_traces(own_traces)
+    retained_blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    cache = FUNCTION_CACHES.get(func.__name__, {})
+    return {
+        "peak": max(0, peak - baseline),
+        "retained_blocks": max(0, retained_blocks),
+        "cache_entries": len(cache),
+        "cache_bytes": sys.getsizeof(cache) + sum(sys.getsizeof(v) for v in cache.values()),
+    }
+
+
 def generate_test_numbers(start=0, end=20, step=1):
     """
     Генерация фиксированного списка тестовых данных (чтобы данные не менялись между запусками)
@@ -116,77 +430,195 @@ def generate_test_numbers(start=0, end=20, step=1):
     return list(range(start, end + 1, step))
 
 
-def run_benchmark(test_numbers, runs=100):
+# Ядро, к которому привязан текущий процесс пула, и очередь свободных ядер (см. _pin_worker)
+_worker_cpu = None
+_worker_cpus = None
+
+
+def _pin_worker(cpus):
+    """
+    Инициализатор процесса пула: занимает свободное ядро из очереди и привязывается к нему
+    :param cpus: Очередь свободных ядер; ядро возвращается в нее по завершении задачи
+    """
+    global _worker_cpu, _worker_cpus
+    _worker_cpus = cpus
+    _worker_cpu = cpus.get()
+    # Привязка процесса к ядру снижает шум от миграции между ядрами (только Linux)
+    os.sched_setaffinity(0, {_worker_cpu})
+
+
+def _benchmark_function(func_name, test_numbers, runs, profile=False):
+    """
+    Замер одной функции для всех n в отдельном процессе пула
+    :param func_name: Имя тестируемой функции (функции передаются по имени, т.к. процесс новый)
+    :param test_numbers: Список тестовых данных
+    :param runs: Количество запусков для каждого тестового пункта
+    :param profile: Дополнительно снимать профиль памяти (см. get_memory_usage)
+    :return: Кортеж (имя функции, список времен, список профилей памяти или None)
+    """
+    func = globals()[func_name]
+    times = []
+    memory = [] if profile else None
+    try:
+        for n in test_numbers:
+            # Память снимается до замера времени, чтобы tracemalloc не искажал тайминги
+            if profile:
+                memory.append(get_memory_usage(func, n))
+            times.append(get_average_time(func, n, runs))
+    finally:
+        # Процесс выполняет одну задачу (max_tasks_per_child=1): ядро освобождается для следующего
+        if _worker_cpu is not None:
+            _worker_cpus.put(_worker_cpu)
+    return func_name, times, memory
+
+
+def run_benchmark_parallel(test_numbers, runs=100, workers=None, memory_results=None, approximate=False):
+    """
+    Параллельный бенчмаркинг: каждая функция замеряется в новом интерпретаторе
+    :param test_numbers: Список тестовых данных
+    :param runs: Количество запусков для каждого тестового пункта
+    :param workers: Количество процессов (по умолчанию — по числу функций, но не больше числа ядер)
+    :param memory_results: Словарь для профилей памяти (см. run_benchmark)
+    :param approximate: Замерять также приближенные функции (см. run_benchmark)
+    :return: Результаты в том же формате, что и run_benchmark
+    """
+    functions = BENCHMARK_FUNCTIONS + (APPROXIMATE_FUNCTIONS if approximate else [])
+    # Доступные ядра: учитываем ограничения affinity, если они заданы
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = []
+    if workers is None:
+        workers = max(1, min(len(functions), len(cpus) or os.cpu_count() or 1))
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # spawn + max_tasks_per_child=1: каждая функция стартует в чистом процессе,
+    # поэтому глобальные кэши (fact_iter_memo_cache) не переходят между замерами
+    context = multiprocessing.get_context("spawn")
+    # Ядра раздаются процессам, а не функциям: новый процесс занимает ядро, освобожденное
+    # завершившимся, поэтому одновременно работающие процессы не делят ядро
+    # (если workers не больше числа ядер)
+    pool_options = {}
+    if cpus and hasattr(os, "sched_setaffinity"):
+        free_cpus = context.Queue()
+        for i in range(workers):
+            free_cpus.put(cpus[i % len(cpus)])
+        pool_options = {"initializer": _pin_worker, "initargs": (free_cpus,)}
+    profile = memory_results is not None
+    results = {}
+    print(f"Начало параллельного бенчмаркинга ({workers} процессов, каждое n запускается {runs} раз)...")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, max_tasks_per_child=1, **pool_options) as pool:
+        futures = []
+        for func in functions:
+            futures.append(pool.submit(_benchmark_function, func.__name__, list(test_numbers), runs, profile))
+        # Сбор результатов в порядке списка функций (как в последовательном режиме)
+        for future in futures:
+            func_name, times, memory = future.result()
+            results[func_name] = times
+            if profile:
+                memory_results[func_name] = memory
+    print("Бенчмаркинг завершен!")
+    return results
+
+
+def run_benchmark(test_numbers, runs=100, parallel=False, workers=None, memory_results=None, approximate=False):
     """
     Запуск бенчмаркинга для всех функций вычисления факториала
     :param test_numbers: Список тестовых данных
     :param runs: Количество запусков для каждого тестового пункта
+    :param parallel: Запускать замеры в пуле процессов (см. run_benchmark_parallel)
+    :param workers: Количество процессов для параллельного режима
+    :param memory_results: Словарь, в который записываются профили памяти для каждой функции и n
+                           (ключ: имя функции, значение: список результатов get_memory_usage);
+                           None — память не профилируется
+    :param approximate: Замерять также приближенные функции APPROXIMATE_FUNCTIONS
+                        (логарифм, число цифр, нули в конце, ряд Стирлинга) рядом с точными
     :return: Словарь с результатами (ключ: имя функции, значение: список времен)
     """
+    if parallel:
+        return run_benchmark_parallel(test_numbers, runs, workers, memory_results, approximate)
+
     # Список тестируемых функций
-    functions = [fact_recursive, fact_iterative, fact_recursive_memo, fact_iterative_memo]
-    # Инициализация словаря для сохранения результатов
+    functions = BENCHMARK_FUNCTIONS + (APPROXIMATE_FUNCTIONS if approximate else [])
+    # Инициализация словарей для сохранения результатов
     results = {func.__name__: [] for func in functions}
+    profile = memory_results is not None
+    if profile:
+        memory_results.update((func.__name__, []) for func in functions)
 
     # Перебор каждого тестового пункта и вычисление среднего времени для всех функций
     print(f"Начало бенчмаркинга (каждое n запускается {runs} раз)...")
     for n in test_numbers:
         print(f"Тестируется n = {n:2d}", end="\r")
         for func in functions:
+            # Память снимается до замера времени, чтобы tracemalloc не искажал тайминги
+            if profile:
+                memory_results[func.__name__].append(get_memory_usage(func, n))
             avg_time = get_average_time(func, n, runs)
             results[func.__name__].append(avg_time)
     print("\nБенчмаркинг завершен!")
     return results
 
 
+def print_results(results, test_numbers, memory=None):
+    """
+    Вывод детальной таблицы результатов бенчмаркинга
+    :param results: Словарь с результатами бенчмаркинга (время)
+    :param test_numbers: Список тестовых данных
+    :param memory: Профили памяти из run_benchmark(memory_results=...) (None — не выводить)
+    """
+    print("\n" + "="*80)
+    print("Результаты бенчмаркинга (среднее время выполнения, единица: секунды)")
+    print("="*80)
+    # Вывод заголовков столбцов
+    print(f"{'n':<6}", end="")
+    for func_name in results.keys():
+        print(f"{func_name:<22}", end="")
+    print("\n" + "-"*80)
+    # Вывод данных для каждого тестового n
+    for i, n in enumerate(test_numbers):
+        print(f"{n:<6}", end="")
+        for func_name in results.keys():
+            time = results[func_name][i]
+            print(f"{time:<22.8f}", end="")  # Сохраняем 8 знаков после запятой для удобства сравнения
+        print()
+
+    if memory is None:
+        return
+
+    print("\n" + "="*80)
+    print("Профиль памяти (пик, байты / оставшиеся блоки / записи кэша)")
+    print("="*80)
+    print(f"{'n':<6}", end="")
+    for func_name in memory.keys():
+        print(f"{func_name:<22}", end="")
+    print("\n" + "-"*80)
+    for i, n in enumerate(test_numbers):
+        print(f"{n:<6}", end="")
+        for func_name in memory.keys():
+            stats = memory[func_name][i]
+            cell = f"{stats['peak']}/{stats['retained_blocks']}/{stats['cache_entries']}"
+            print(f"{cell:<22}", end="")
+        print()
+
+
 # ------------------------------
 # Функция для построения графика производительности
 # ------------------------------
-def plot_performance(results, test_numbers, save_path="factorial_performance.png"):
+def plot_performance(results, test_numbers, save_path="factorial_performance.png", memory=None):
     """
-    Построение графика сравнения производительности (наглядно показывает зависимость времени от n)
+    Построение графика сравнения производительности (см. plotting.plot_performance)
     :param results: Словарь с результатами бенчмаркинга
     :param test_numbers: Список тестовых данных (ось X)
     :param save_path: Путь для сохранения изображения (по умолчанию в текущую директорию)
+    :param memory: Профили памяти из run_benchmark(memory_results=...) — выводятся второй панелью
     """
-    # Решение проблемы с отображением русских символов в matplotlib
-    plt.rcParams['font.sans-serif'] = ['DejaVu Sans', 'Arial', 'Helvetica']
-    plt.rcParams['axes.unicode_minus'] = False
-
-    # Определение стиля для каждой линии (чтобы отличать четыре реализации)
-    line_styles = {
-        "fact_recursive": {"color": "#e74c3c", "marker": "o", "label": "Рекурсия (без мемоизации)"},
-        "fact_iterative": {"color": "#3498db", "marker": "s", "label": "Итерация (без мемоизации)"},
-        "fact_recursive_memo": {"color": "#2ecc71", "marker": "^", "label": "Рекурсия (с мемоизацией)"},
-        "fact_iterative_memo": {"color": "#f39c12", "marker": "D", "label": "Итерация (с мемоизацией)"}
-    }
-
-    # Создание фигуры и осей
-    fig, ax = plt.subplots(figsize=(10, 6))
-
-    # Построение кривой производительности для каждой функции
-    for func_name, times in results.items():
-        style = line_styles[func_name]
-        ax.plot(
-            test_numbers, times,
-            color=style["color"],
-            marker=style["marker"],
-            label=style["label"],
-            linewidth=2,
-            markersize=6
-        )
-
-    # Настройка внешнего вида графика
-    ax.set_xlabel("Входной параметр n (основание факториала)", fontsize=12)
-    ax.set_ylabel("Среднее время выполнения (секунды)", fontsize=12)
-    ax.set_title("Сравнение производительности четырех реализаций функции факториала", fontsize=14, fontweight="bold")
-    ax.legend(fontsize=10, loc="upper left")
-    ax.grid(True, alpha=0.3)  # Отображение сетки для удобства чтения данных
-
-    # Сохранение изображения (высокое разрешение)
-    plt.tight_layout()
-    plt.savefig(save_path, dpi=300, bbox_inches="tight")
-    print(f"\nГрафик производительности сохранен по пути: {save_path}")
+    # matplotlib импортируется только при построении графика: импорт функций
+    # факториала остается быстрым и не требует графического окружения
+    from plotting import plot_performance as _plot_performance
+    _plot_performance(results, test_numbers, save_path, memory)
 
 
 # ------------------------------
@@ -196,26 +628,24 @@ if __name__ == "__main__":
     # 1. Конфигурация параметров теста
     TEST_RUNS = 100  # Количество запусков для каждого тестового пункта
     TEST_NUMBERS = generate_test_numbers(start=0, end=20)  # Фиксированные тестовые данные
+    TEST_PARALLEL = False  # Запуск в пуле процессов (каждая функция — в отдельном интерпретаторе)
+    TEST_PROFILE = False  # Профилирование памяти (tracemalloc) для каждой функции и n
+    TEST_APPROXIMATE = False  # Замерять также приближенные функции (log_factorial, Стирлинг и др.)
+    TEST_PARALLEL_FACTORIAL_N = 0  # n для сравнения fact_parallel с math.factorial (0 — не запускать)
 
     # 2. Запуск бенчмаркинга
-    benchmark_results = run_benchmark(TEST_NUMBERS, TEST_RUNS)
+    benchmark_memory = {} if TEST_PROFILE else None
+    benchmark_results = run_benchmark(
+        TEST_NUMBERS, TEST_RUNS, parallel=TEST_PARALLEL, memory_results=benchmark_memory, approximate=TEST_APPROXIMATE
+    )
 
     # 3. Вывод детальной таблицы результатов
-    print("\n" + "="*80)
-    print("Результаты бенчмаркинга (среднее время выполнения, единица: секунды)")
-    print("="*80)
-    # Вывод заголовков столбцов
-    print(f"{'n':<6}", end="")
-    for func_name in benchmark_results.keys():
-        print(f"{func_name:<22}", end="")
-    print("\n" + "-"*80)
-    # Вывод данных для каждого тестового n
-    for i, n in enumerate(TEST_NUMBERS):
-        print(f"{n:<6}", end="")
-        for func_name in benchmark_results.keys():
-            time = benchmark_results[func_name][i]
-            print(f"{time:<22.8f}", end="")  # Сохраняем 8 знаков после запятой для удобства сравнения
-        print()
+    print_results(benchmark_results, TEST_NUMBERS, benchmark_memory)
 
     # 4. Построение графика производительности
-    plot_performance(benchmark_results, TEST_NUMBERS)
+    plot_performance(benchmark_results, TEST_NUMBERS, memory=benchmark_memory)
+
+    # 5. Сравнение параллельного факториала с math.factorial для больших n
+    if TEST_PARALLEL_FACTORIAL_N:
+        parallel_results = benchmark_parallel_factorial(TEST_PARALLEL_FACTORIAL_N, worker_counts=sorted({1, 2, 4, os.cpu_count() or 1}))
+        print_parallel_results(parallel_results, TEST_PARALLEL_FACTORIAL_N)
@@ -0,0 +1,84 @@
+"""
+Построение графиков производительности для бенчмаркинга факториала.
+
+Модуль импортируется лениво из main.plot_performance, поэтому matplotlib
+загружается только при построении графика. Используется backend Agg:
+график сохраняется в файл и не требует дисплея.
+"""
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+
+def plot_performance(results, test_numbers, save_path="factorial_performance.png", memory=None):
+    """
+    Построение графика сравнения производительности (наглядно показывает зависимость времени от n)
+    :param results: Словарь с результатами бенчмаркинга
+    :param test_numbers: Список тестовых данных (ось X)
+    :param save_path: Путь для сохранения изображения (по умолчанию в текущую директорию)
+    :param memory: Профили памяти (None — строится только график времени)
+    """
+    # Решение проблемы с отображением русских символов в matplotlib
+    plt.rcParams['font.sans-serif'] = ['DejaVu Sans', 'Arial', 'Helvetica']
+    plt.rcParams['axes.unicode_minus'] = False
+
+    # Определение стиля для каждой линии (чтобы отличать четыре реализации)
+    line_styles = {
+        "fact_recursive": {"color": "#e74c3c", "marker": "o", "label": "Рекурсия (без мемоизации)"},
+        "fact_iterative": {"color": "#3498db", "marker": "s", "label": "Итерация (без мемоизации)"},
+        "fact_recursive_memo": {"color": "#2ecc71", "marker": "^", "label": "Рекурсия (с мемоизацией)"},
+        "fact_iterative_memo": {"color": "#f39c12", "marker": "D", "label": "Итерация (с мемоизацией)"},
+        "log_factorial": {"color": "#9b59b6", "marker": "v", "label": "ln(n!) через lgamma"},
+        "factorial_digits": {"color": "#1abc9c", "marker": "x", "label": "Число цифр n!"},
+        "factorial_trailing_zeros": {"color": "#7f8c8d", "marker": "+", "label": "Нули в конце n!"},
+        "stirling_log_factorial": {"color": "#34495e", "marker": "*", "label": "Ряд Стирлинга"}
+    }
+
+    # Создание фигуры и осей (вторая панель — пиковая память, если есть профиль)
+    if memory is None:
+        fig, ax = plt.subplots(figsize=(10, 6))
+    else:
+        fig, (ax, mem_ax) = plt.subplots(2, 1, figsize=(10, 11), sharex=True)
+
+    # Построение кривой производительности для каждой функции
+    for func_name, times in results.items():
+        style = line_styles[func_name]
+        ax.plot(
+            test_numbers, times,
+            color=style["color"],
+            marker=style["marker"],
+            label=style["label"],
+            linewidth=2,
+            markersize=6
+        )
+
+    # Настройка внешнего вида графика
+    ax.set_xlabel("Входной параметр n (основание факториала)", fontsize=12)
+    ax.set_ylabel("Среднее время выполнения (секунды)", fontsize=12)
+    ax.set_title("Сравнение производительности четырех реализаций функции факториала", fontsize=14, fontweight="bold")
+    ax.legend(fontsize=10, loc="upper left")
+    ax.grid(True, alpha=0.3)  # Отображение сетки для удобства чтения данных
+
+    # Панель памяти: пиковый прирост памяти во время вызова
+    if memory is not None:
+        for func_name, stats in memory.items():
+            style = line_styles[func_name]
+            mem_ax.plot(
+                test_numbers, [s["peak"] for s in stats],
+                color=style["color"],
+                marker=style["marker"],
+                label=style["label"],
+                linewidth=2,
+                markersize=6
+            )
+        mem_ax.set_xlabel("Входной параметр n (основание факториала)", fontsize=12)
+        mem_ax.set_ylabel("Пиковая память (байты)", fontsize=12)
+        mem_ax.set_title("Пиковое потребление памяти (tracemalloc)", fontsize=14, fontweight="bold")
+        mem_ax.legend(fontsize=10, loc="upper left")
+        mem_ax.grid(True, alpha=0.3)
+
+    # Сохранение изображения (высокое разрешение)
+    plt.tight_layout()
+    plt.savefig(save_path, dpi=300, bbox_inches="tight")
+    print(f"\nГрафик производительности сохранен по пути: {save_path}")
@@ -1,10 +1,26 @@
+import math
+import os
+import queue
+import subprocess
+import sys
 import unittest
+from unittest.mock import patch
+import main
 from main import (
     fact_recursive,
     fact_iterative,
     fact_recursive_memo,
     fact_iterative_memo,
-    fact_iter_memo_cache  # Импорт кэша для итеративной мемоизации (для сброса)
+    fact_iter_memo_cache,  # Импорт кэша для итеративной мемоизации (для сброса)
+    fact_parallel,
+    log_factorial,
+    log_factorial_array,
+    factorial_digits,
+    factorial_trailing_zeros,
+    stirling_log_factorial,
+    stirling_factorial,
+    benchmark_parallel_factorial,
+    run_benchmark
 )
 
 
@@ -69,6 +85,175 @@ class TestFactorialFunctions(unittest.TestCase):
                         func(n)
 
 
+class TestBenchmark(unittest.TestCase):
+    """Тестирование формата результатов бенчмаркинга"""
+
+    def test_parallel_matches_sequential_shape(self):
+        """Параллельный режим возвращает словарь того же вида, что и последовательный"""
+        test_numbers = [0, 5, 10]
+        sequential = run_benchmark(test_numbers, runs=1)
+        parallel = run_benchmark(test_numbers, runs=1, parallel=True, workers=2)
+
+        self.assertEqual(list(parallel.keys()), list(sequential.keys()))
+        for func_name, times in parallel.items():
+            self.assertEqual(len(times), len(test_numbers))
+            self.assertTrue(all(t >= 0 for t in times))
+
+    def test_parallel_more_functions_than_workers(self):
+        """Функций больше, чем процессов: ядра переходят к новым процессам, замер не зависает"""
+        results = run_benchmark([0, 5], runs=1, parallel=True, workers=2, approximate=True)
+        self.assertEqual(len(results), len(main.BENCHMARK_FUNCTIONS) + len(main.APPROXIMATE_FUNCTIONS))
+
+    def test_worker_releases_cpu(self):
+        """Процесс пула занимает ядро из очереди и возвращает его после задачи"""
+        cpus = queue.Queue()
+        cpus.put(3)
+        try:
+            with patch("main.os.sched_setaffinity") as set_affinity:
+                main._pin_worker(cpus)
+            set_affinity.assert_called_once_with(0, {3})
+            self.assertTrue(cpus.empty())
+            main._benchmark_function("fact_iterative", [5], 1)
+            self.assertEqual(cpus.get_nowait(), 3)
+        finally:
+            main._worker_cpu = main._worker_cpus = None
+
+    def test_profile_mode(self):
+        """Режим профилирования записывает пиковую память, блоки и размер кэша для каждого n"""
+        fact_iter_memo_cache.clear()
+        fact_iter_memo_cache.update({0: 1, 1: 1})
+        test_numbers = [5, 50]
+        memory = {}
+        results = run_benchmark(test_numbers, runs=1, memory_results=memory)
+
+        # Результат имеет тот же формат, что и без профилирования
+        self.assertIsInstance(results, dict)
+        self.assertEqual(list(memory.keys()), list(results.keys()))
+        for func_name, stats in memory.items():
+            self.assertEqual(len(stats), len(test_numbers))
+            for item in stats:
+                self.assertEqual(set(item), {"peak", "retained_blocks", "cache_entries", "cache_bytes"})
+        # Глобальный кэш итеративной мемоизации растет вместе с n
+        self.assertEqual(memory["fact_iterative_memo"][-1]["cache_entries"], 51)
+        self.assertEqual(memory["fact_iterative"][-1]["cache_entries"], 0)
+
+
+class TestParallelFactorial(unittest.TestCase):
+    """Тестирование параллельного факториала (порог снижен, чтобы пул использовался на малых n)"""
+
+    def test_matches_math_factorial(self):
+        """Результат совпадает с math.factorial при разном количестве процессов и блоков"""
+        for workers in (1, 2, 3):
+            for n in (0, 1, 2, 17, 1000, 4321):
+                with self.subTest(workers=workers, n=n):
+                    self.assertEqual(fact_parallel(n, workers=workers, threshold=0), math.factorial(n))
+
+    def test_invalid_input(self):
+        """Отрицательное n вызывает ValueError"""
+        with self.assertRaises(ValueError):
+            fact_parallel(-1)
+
+    def test_benchmark_shape(self):
+        """Бенчмарк возвращает время math.factorial и каждого количества процессов"""
+        results = benchmark_parallel_factorial(2000, worker_counts=(1, 2), runs=1)
+        self.assertEqual(list(results), ["math.factorial", 1, 2])
+        self.assertTrue(all(t >= 0 for t in results.values()))
+
+
+class TestApproximateFunctions(unittest.TestCase):
+    """Тестирование величин, вычисляемых без построения n!"""
+
+    # n, на которых сверяемся с точным math.factorial
+    CHECK_NUMBERS = [0, 1, 2, 5, 9, 10, 24, 25, 100, 125, 1000, 1234]
+
+    def test_digits_and_trailing_zeros(self):
+        """Число цифр и нулей в конце совпадают с точным n!"""
+        for n in self.CHECK_NUMBERS:
+            with self.subTest(n=n):
+                exact = math.factorial(n)
+                self.assertEqual(factorial_digits(n), len(str(exact)))
+                zeros = 0
+                while exact % 10 == 0:
+                    exact //= 10
+                    zeros += 1
+                self.assertEqual(factorial_trailing_zeros(n), zeros)
+
+    def test_log_factorial(self):
+        """ln(n!) совпадает с логарифмом точного значения, векторная версия — со скалярной"""
+        for n in (0, 1, 10, 100):
+            self.assertAlmostEqual(log_factorial(n), math.log(math.factorial(n)), places=9)
+        values = [0, 1, 7, 255, 256, 1000, 10 ** 6]
+        vectorized = log_factorial_array(values)
+        for n, value in zip(values, vectorized):
+            # Относительная погрешность (для n = 0 и 1 значение равно нулю)
+            self.assertAlmostEqual(value, log_factorial(n), delta=1e-12 * max(1.0, log_factorial(n)))
+
+    def test_log_factorial_table_built_once(self):
+        """Таблица lgamma строится при первом вызове и переиспользуется дальше"""
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("NumPy не установлен")
+        log_factorial_array([5])
+        table = main._log_factorial_table
+        self.assertIsNotNone(table)
+        log_factorial_array([3, 300])
+        self.assertIs(main._log_factorial_table, table)
+
+    def test_stirling_error_bound(self):
+        """Фактическая погрешность ряда Стирлинга не превышает заявленной границы"""
+        for n in (1, 2, 10, 50, 170):
+            for terms in range(6):
+                with self.subTest(n=n, terms=terms):
+                    value, bound = stirling_log_factorial(n, terms)
+                    self.assertLessEqual(abs(value - log_factorial(n)), bound + 1e-12 * log_factorial(n))
+        value, relative_bound = stirling_factorial(20)
+        self.assertLessEqual(abs(value / math.factorial(20) - 1), relative_bound + 1e-15)
+
+    def test_invalid_inputs(self):
+        """Отрицательное n вызывает ValueError"""
+        for func in (log_factorial, factorial_digits, factorial_trailing_zeros, stirling_log_factorial):
+            with self.subTest(func_name=func.__name__):
+                with self.assertRaises(ValueError):
+                    func(-1)
+
+    def test_benchmark_exposes_approximations(self):
+        """run_benchmark(approximate=True) замеряет приближенные функции рядом с точными"""
+        results = run_benchmark([5, 10], runs=1, approximate=True)
+        self.assertEqual(list(results)[:4], ["fact_recursive", "fact_iterative", "fact_recursive_memo", "fact_iterative_memo"])
+        self.assertIn("stirling_log_factorial", results)
+        self.assertIn("factorial_trailing_zeros", results)
+
+
+class TestImportTime(unittest.TestCase):
+    """Проверка времени импорта модуля с функциями факториала"""
+
+    # Бюджет на импорт main (микросекунды, накопленное время по данным -X importtime)
+    IMPORT_BUDGET_US = 50_000
+
+    def test_core_import_under_budget(self):
+        """Импорт main укладывается в бюджет и не подтягивает matplotlib"""
+        lab_dir = os.path.dirname(os.path.abspath(__file__))
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import main"],
+            cwd=lab_dir, capture_output=True, text=True, check=True
+        )
+        # Формат строк: "import time: self [us] | cumulative | imported package"
+        modules = {}
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "imported package" in line:
+                continue
+            _, self_us, cumulative_us, name = [part.strip() for part in line.replace("import time:", "|").split("|")]
+            modules[name] = int(cumulative_us)
+
+        self.assertIn("main", modules)
+        self.assertNotIn("matplotlib", modules)
+        self.assertLess(
+            modules["main"], self.IMPORT_BUDGET_US,
+            msg=f"Импорт main занял {modules['main']} мкс (бюджет {self.IMPORT_BUDGET_US} мкс)"
+        )
+
+
 if __name__ == "__main__":
     # Запуск всех тестовых случаев
     unittest.main()
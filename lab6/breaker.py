@@ -0,0 +1,129 @@
+"""
+Автоматический выключатель для запросов к API ЦБ РФ.
+
+Во время сбоя API CircuitBreaker не выполняет запросы и выдает последний
+успешный снимок документа (StaleRates — курсы из такого снимка).
+"""
+
+import threading
+import time
+
+import requests
+
+
+class CircuitOpenError(requests.RequestException):
+    """Цепь разомкнута: запрос не выполняется, а сохраненного снимка нет"""
+
+
+class StaleRates(dict):
+    """
+    Курсы из последнего успешного снимка, выданные во время сбоя API
+    
+    Ведет себя как обычный словарь {код: курс}; атрибут stale всегда True,
+    fetched_at — время получения снимка (time.time()).
+    """
+    
+    stale = True
+    
+    def __init__(self, rates, fetched_at):
+        super().__init__(rates)
+        self.fetched_at = fetched_at
+
+
+class CircuitBreaker:
+    """
+    Автоматический выключатель для запросов к API с выдачей устаревшего снимка
+    
+    После failure_threshold сетевых ошибок подряд цепь размыкается, и запросы
+    не выполняются reset_timeout секунд. Затем один пробный запрос (полуоткрытое
+    состояние) либо замыкает цепь, либо снова размыкает ее. Пока запрос
+    невозможен или завершился ошибкой, возвращается последний успешный
+    документ для URL с признаком устаревания.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        """
+        Args:
+            failure_threshold (int): Число ошибок подряд до размыкания цепи
+            reset_timeout (float): Время в секундах до пробного запроса
+            clock (Callable): Источник монотонного времени (для тестов)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+        self._snapshots = {}  # URL -> (документ, время получения)
+    
+    def call(self, url, fetch):
+        """
+        Выполняет fetch() через выключатель
+        
+        Args:
+            url (str): URL документа (ключ сохраненного снимка)
+            fetch (Callable): Функция загрузки документа
+        
+        Returns:
+            tuple: (документ, устарел ли он, время получения)
+        
+        Raises:
+            CircuitOpenError: Если цепь разомкнута и снимка нет
+            requests.RequestException: Если запрос не удался и снимка нет
+            Exception: Прочие ошибки fetch() (например, ValueError разбора) —
+                       учитываются как сбой и передаются без выдачи снимка
+        """
+        if not self._allow_request():
+            return self._stale(url, CircuitOpenError("Цепь разомкнута: API ЦБ РФ временно недоступен"))
+        
+        try:
+            data = fetch()
+        except requests.RequestException as e:
+            self._record_failure()
+            return self._stale(url, e)
+        except BaseException:
+            # Любая другая ошибка тоже снимает флаг пробного запроса, иначе цепь не замкнется никогда
+            self._record_failure()
+            raise
+        
+        fetched_at = time.time()
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+            self._snapshots[url] = (data, fetched_at)
+        return data, False, fetched_at
+    
+    def _allow_request(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self._clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            # В полуоткрытом состоянии пропускается только один пробный запрос
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+    
+    def _record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self._clock()
+    
+    def _stale(self, url, error):
+        with self._lock:
+            snapshot = self._snapshots.get(url)
+        if snapshot is None:
+            raise error
+        data, fetched_at = snapshot
+        return data, True, fetched_at
@@ -0,0 +1,89 @@
+"""
+Объединение одновременных запросов одного документа (single-flight).
+"""
+
+import copy
+import threading
+import time
+
+
+class RequestCoalescer:
+    """
+    Объединение одновременных запросов одного документа
+    
+    Первый вызов для URL становится ведущим и сразу выполняет запрос. Все
+    вызовы, пришедшие до его завершения, получают тот же разобранный документ
+    или копию того же исключения (у каждого вызова свой объект). При window > 0
+    ведущий перед запросом ждет window секунд, собирая другие вызовы.
+    В отличие от RatesCache, результат после завершения не хранится.
+    """
+    
+    def __init__(self, window=0.0):
+        """
+        Args:
+            window (float): Окно сбора одновременных вызовов в секундах
+                            (0 — без ожидания: объединяются вызовы во время запроса)
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._flights = {}  # URL -> текущий запрос
+        self.fetches = 0
+        self.coalesced = 0
+    
+    def get(self, url, fetch):
+        """
+        Возвращает документ по URL, объединяя одновременные вызовы
+        
+        Args:
+            url (Hashable): Ключ объединения (обычно URL документа)
+            fetch (Callable): Функция загрузки документа (вызывается ведущим)
+        
+        Returns:
+            Результат fetch() (обычно разобранный документ)
+        
+        Raises:
+            Exception: Ошибка fetch(); ведущий получает исходный объект, остальные —
+                       его копию со ссылкой на исходный в __cause__
+        """
+        with self._lock:
+            flight = self._flights.get(url)
+            leader = flight is None
+            if leader:
+                flight = {'done': threading.Event(), 'data': None, 'error': None}
+                self._flights[url] = flight
+                self.fetches += 1
+            else:
+                self.coalesced += 1
+        
+        if leader:
+            try:
+                if self.window:
+                    time.sleep(self.window)
+                flight['data'] = fetch()
+            except Exception as e:
+                flight['error'] = e
+            finally:
+                with self._lock:
+                    del self._flights[url]
+                flight['done'].set()
+        else:
+            flight['done'].wait()
+        
+        error = flight['error']
+        if error is None:
+            return flight['data']
+        if leader:
+            raise error
+        # Один объект исключения не выбрасывается в нескольких потоках: у каждого свой traceback
+        try:
+            waiter_error = copy.copy(error)
+        except Exception:
+            waiter_error = None
+        if waiter_error is None:
+            raise error
+        raise waiter_error from error
+    
+    def stats(self):
+        """Возвращает количество выполненных и объединенных запросов"""
+        with self._lock:
+            return {'fetches': self.fetches, 'coalesced': self.coalesced}
@@ -0,0 +1,134 @@
+"""
+Локальная история курсов валют.
+
+HistoryStore хранит загруженные архивные документы в SQLite, RateSeries —
+компактный временной ряд курса одной валюты на основе array.
+"""
+
+import sqlite3
+import threading
+from array import array
+from datetime import date
+
+
+# Файл локального хранилища истории курсов по умолчанию
+DEFAULT_HISTORY_PATH = "currency_history.sqlite3"
+
+
+class RateSeries:
+    """
+    Компактный временной ряд курса одной валюты
+    
+    Даты хранятся как порядковые номера (date.toordinal) в array('l'),
+    значения — в array('d').
+    """
+    
+    __slots__ = ('code', 'ordinals', 'values')
+    
+    def __init__(self, code, ordinals=None, values=None):
+        self.code = code
+        self.ordinals = ordinals if ordinals is not None else array('l')
+        self.values = values if values is not None else array('d')
+    
+    def __len__(self):
+        return len(self.values)
+    
+    def dates(self):
+        """Возвращает список дат ряда"""
+        return [date.fromordinal(ordinal) for ordinal in self.ordinals]
+    
+    def items(self):
+        """Возвращает пары (дата, курс)"""
+        return list(zip(self.dates(), self.values))
+
+
+class HistoryStore:
+    """
+    Локальное хранилище истории курсов в SQLite
+    
+    Таблица rates индексирована по (day, code); таблица days отмечает уже
+    загруженные даты, включая даты без документа (выходные и праздники),
+    чтобы не запрашивать их повторно.
+    """
+    
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        """
+        Args:
+            path (str): Путь к файлу базы данных (':memory:' — в памяти)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS days (day INTEGER PRIMARY KEY, available INTEGER NOT NULL)'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS rates ('
+                'day INTEGER NOT NULL, code TEXT NOT NULL, value REAL NOT NULL, nominal INTEGER NOT NULL, '
+                'PRIMARY KEY (day, code))'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS rates_code_day ON rates (code, day)')
+    
+    def missing_days(self, start, end):
+        """Возвращает даты из диапазона [start, end], которых еще нет в хранилище"""
+        with self._lock:
+            stored = {
+                row[0] for row in self._conn.execute(
+                    'SELECT day FROM days WHERE day BETWEEN ? AND ?',
+                    (start.toordinal(), end.toordinal())
+                )
+            }
+        return [
+            date.fromordinal(ordinal)
+            for ordinal in range(start.toordinal(), end.toordinal() + 1)
+            if ordinal not in stored
+        ]
+    
+    def save_day(self, day, data):
+        """
+        Сохраняет документ за дату
+        
+        Дата отмечается загруженной, только если она уже прошла: документ за
+        сегодняшнюю или будущую дату может появиться или измениться позже,
+        поэтому такие даты запрашиваются снова при следующем вызове.
+        
+        Args:
+            day (date): Дата документа
+            data (dict): Разобранный ответ API или None, если документа нет
+        """
+        ordinal = day.toordinal()
+        final = day < date.today()
+        rows = [
+            (ordinal, code, item['Value'], item.get('Nominal', 1))
+            for code, item in (data or {}).get('Valute', {}).items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany('INSERT OR REPLACE INTO rates VALUES (?, ?, ?, ?)', rows)
+            if final:
+                self._conn.execute('INSERT OR REPLACE INTO days VALUES (?, ?)', (ordinal, int(data is not None)))
+    
+    def series(self, code, start, end):
+        """Возвращает RateSeries валюты code за диапазон [start, end]"""
+        result = RateSeries(code)
+        with self._lock:
+            cursor = self._conn.execute(
+                'SELECT day, value FROM rates WHERE code = ? AND day BETWEEN ? AND ? ORDER BY day',
+                (code.upper(), start.toordinal(), end.toordinal())
+            )
+            for ordinal, value in cursor:
+                result.ordinals.append(ordinal)
+                result.values.append(value)
+        return result
+    
+    def has_rates(self, start, end):
+        """Проверяет, есть ли в диапазоне хотя бы один сохраненный курс"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM rates WHERE day BETWEEN ? AND ? LIMIT 1',
+                (start.toordinal(), end.toordinal())
+            ).fetchone()
+        return row is not None
+    
+    def close(self):
+        self._conn.close()
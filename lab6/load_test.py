@@ -0,0 +1,145 @@
+"""
+Нагрузочное тестирование get_currencies на локальном имитаторе API ЦБ РФ.
+
+Запускает N потоков (или асинхронных задач), которые вызывают
+get_currencies / async_get_currencies, и измеряет задержку (p50/p99)
+и пропускную способность (запросов в секунду).
+
+Запуск:
+    python load_test.py --threads 16 --requests 2000 --latency 0.005
+    python load_test.py --mode async --threads 32 --cache
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from main import get_currencies, async_get_currencies, create_session, RatesCache
+from mock_server import MockCBRServer
+
+
+def percentile(sorted_values, q):
+    """
+    Перцентиль отсортированной выборки (метод ближайшего ранга)
+
+    Args:
+        sorted_values (list): Отсортированные значения
+        q (float): Перцентиль от 0 до 100
+
+    Returns:
+        float: Значение перцентиля (0.0 для пустой выборки)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies, errors, elapsed):
+    """Сводка нагрузочного теста: p50/p99 в миллисекундах, запросов в секунду, ошибки"""
+    latencies = sorted(latencies)
+    total = len(latencies)
+    return {
+        'requests': total,
+        'errors': errors,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'rps': total / elapsed if elapsed else 0.0,
+    }
+
+
+def run_load_test(call, threads=8, requests_total=200):
+    """
+    Нагрузочный тест в потоках
+
+    Args:
+        call (Callable): Функция без аргументов; результат None считается ошибкой
+        threads (int): Количество одновременных потоков
+        requests_total (int): Общее количество вызовов
+
+    Returns:
+        dict: Сводка (см. summarize)
+    """
+    def timed(_):
+        started = time.perf_counter()
+        result = call()
+        return time.perf_counter() - started, result is None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        samples = list(pool.map(timed, range(requests_total)))
+    elapsed = time.perf_counter() - started
+    return summarize([latency for latency, _ in samples], sum(failed for _, failed in samples), elapsed)
+
+
+def run_async_load_test(call, tasks=8, requests_total=200):
+    """
+    Нагрузочный тест в асинхронных задачах
+
+    Args:
+        call (Callable): Функция без аргументов, возвращающая корутину
+        tasks (int): Количество одновременных задач
+        requests_total (int): Общее количество вызовов
+
+    Returns:
+        dict: Сводка (см. summarize)
+    """
+    async def worker(counter, samples):
+        while counter:
+            counter.pop()
+            started = time.perf_counter()
+            result = await call()
+            samples.append((time.perf_counter() - started, result is None))
+
+    async def run():
+        counter = list(range(requests_total))
+        samples = []
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(counter, samples) for _ in range(tasks)))
+        return samples, time.perf_counter() - started
+
+    samples, elapsed = asyncio.run(run())
+    return summarize([latency for latency, _ in samples], sum(failed for _, failed in samples), elapsed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Нагрузочный тест get_currencies на локальном имитаторе API")
+    parser.add_argument('--mode', choices=['threads', 'async'], default='threads')
+    parser.add_argument('--threads', type=int, default=8, help="Одновременные потоки или задачи")
+    parser.add_argument('--requests', type=int, default=500, help="Общее количество вызовов")
+    parser.add_argument('--latency', type=float, default=0.0, help="Задержка ответа сервера, с")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Доля ответов с ошибкой 503")
+    parser.add_argument('--extra-currencies', type=int, default=0, help="Увеличение размера документа")
+    parser.add_argument('--codes', default='USD,EUR', help="Коды валют через запятую")
+    parser.add_argument('--cache', action='store_true', help="Использовать RatesCache")
+    parser.add_argument('--partial', action='store_true', help="Частичный разбор ответа")
+    args = parser.parse_args(argv)
+
+    codes = args.codes.split(',')
+    session = create_session(pool_maxsize=max(args.threads, 10), retries=0)
+    cache = RatesCache() if args.cache else None
+    with MockCBRServer(latency=args.latency, error_rate=args.error_rate,
+                       extra_currencies=args.extra_currencies) as server:
+        if args.mode == 'threads':
+            result = run_load_test(
+                lambda: get_currencies(codes, url=server.url, session=session, cache=cache, partial=args.partial),
+                threads=args.threads, requests_total=args.requests
+            )
+        else:
+            result = run_async_load_test(
+                lambda: async_get_currencies(codes, url=server.url, session=session, cache=cache),
+                tasks=args.threads, requests_total=args.requests
+            )
+        connections = server.connections
+    session.close()
+
+    print(f"Режим: {args.mode}, параллельность: {args.threads}, вызовов: {result['requests']}")
+    print(f"p50: {result['p50_ms']:.3f} мс, p99: {result['p99_ms']:.3f} мс")
+    print(f"Пропускная способность: {result['rps']:.1f} запросов/с")
+    print(f"Ошибок: {result['errors']}, TCP-соединений: {connections}")
+    return result
+
+
+if __name__ == '__main__':
+    main()
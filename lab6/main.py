@@ -1,7 +1,30 @@
+import codecs
+import json
+import timeit
 import requests
+import asyncio
 import logging
-from functools import wraps
+from functools import wraps, partial
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from metrics import get_metrics
+from transport import DEFAULT_TIMEOUT, create_session, download, parse_document
+from queue_logging import (
+    LazyQueueHandler, RateLimitFilter, RateLimitedQueueListener, JsonFormatter,
+    setup_queue_logging, log_errors_lazy
+)
+from rates_cache import RatesCache
+from history import DEFAULT_HISTORY_PATH, RateSeries, HistoryStore
+from rate_table import RateTable
+from breaker import CircuitBreaker, CircuitOpenError, StaleRates
+from coalescer import RequestCoalescer
+
+
+# Адреса API ЦБ РФ: текущий документ и архив за дату
+DAILY_URL = "https://www.cbr-xml-daily.ru/daily_json.js"
+ARCHIVE_URL = "https://www.cbr-xml-daily.ru/archive/{date:%Y/%m/%d}/daily_json.js"
 
 
 def setup_logging():
@@ -28,6 +51,22 @@ def log_errors(logger):
             try:
                 return func(*args, **kwargs)
             except (requests.RequestException, KeyError, ValueError) as e:
+                get_metrics().increment('errors_total', {'function': func.__name__, 'type': type(e).__name__})
+                logger.error(f"Ошибка в функции {func.__name__}: {str(e)}")
+                return None
+        return wrapper
+    return decorator
+
+
+def log_errors_async(logger):
+    """Декоратор для логирования ошибок корутин (аналог log_errors)"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except (requests.RequestException, KeyError, ValueError) as e:
+                get_metrics().increment('errors_total', {'function': func.__name__, 'type': type(e).__name__})
                 logger.error(f"Ошибка в функции {func.__name__}: {str(e)}")
                 return None
         return wrapper
@@ -37,27 +76,57 @@ def log_errors(logger):
 # Создаем логгер
 currency_logger = setup_logging()
 
+# Общая сессия: соединения с API переиспользуются между вызовами
+currency_session = create_session()
 
-@log_errors(currency_logger)
-def get_currencies(currency_codes, url="https://www.cbr-xml-daily.ru/daily_json.js"):
+# Общий кэш курсов (передается в get_currencies параметром cache)
+currency_cache = RatesCache()
+
+# Общий выключатель (передается в get_currencies параметром breaker)
+currency_breaker = CircuitBreaker()
+
+# Общий объединитель запросов (передается в get_currencies параметром coalescer)
+currency_coalescer = RequestCoalescer()
+
+
+def fetch_rates_document(url, session=None, timeout=DEFAULT_TIMEOUT, cache=None):
     """
-    Получает курсы валют из API ЦБ РФ
+    Загружает и разбирает JSON-документ с курсами валют
     
     Args:
-        currency_codes (list): Список кодов валют (например, ['USD', 'EUR'])
         url (str): URL API ЦБ РФ
+        session (requests.Session): Сессия для запроса (по умолчанию общая currency_session)
+        timeout (float | tuple): Таймаут запроса
+        cache (RatesCache): Кэш ответов; None — без кэширования
     
     Returns:
-        dict: Словарь с курсами валют или None в случае ошибки
+        dict: Разобранный ответ API
     """
-    if not currency_codes:
-        raise ValueError("Список кодов валют не может быть пустым")
+    if session is None:
+        session = currency_session
+    
+    if cache is not None:
+        return cache.get(url, session, timeout)
     
-    response = requests.get(url)
+    response = download(session, url, timeout)
     response.raise_for_status()
+    return parse_document(response)
+
+
+def extract_rates(data, currency_codes):
+    """
+    Извлекает курсы запрошенных валют из ответа API
+    
+    Args:
+        data (dict): Разобранный ответ API
+        currency_codes (list): Список кодов валют
     
-    data = response.json()
+    Returns:
+        dict: Словарь {код: курс}
     
+    Raises:
+        KeyError: Если в ответе нет курсов или запрошенной валюты
+    """
     if 'Valute' not in data:
         raise KeyError("В ответе API отсутствуют курсы валют")
     
@@ -73,6 +142,298 @@ def get_currencies(currency_codes, url="https://www.cbr-xml-daily.ru/daily_json.
     return currencies
 
 
+# Снимки для частичного разбора: текст ответа → {код: курс}, общие для всех вызовов
+_RATE_SNAPSHOTS_SIZE = 8
+_rate_snapshots = OrderedDict()
+_rate_snapshots_lock = threading.Lock()
+
+
+def _indexed_rates(text):
+    """
+    Возвращает курсы документа, проиндексированные по коду валюты
+    
+    Документ разбирается один раз; пока API отдает тот же текст (документ
+    меняется раз в день), повторные вызовы из любых потоков получают
+    готовый индекс: поиск по тексту как ключу словаря — хеш и сравнение
+    строк без разбора JSON. Хранятся последние _RATE_SNAPSHOTS_SIZE документов.
+    
+    Raises:
+        KeyError: Если в документе нет курсов
+    """
+    with _rate_snapshots_lock:
+        rates = _rate_snapshots.get(text)
+        if rates is not None:
+            _rate_snapshots.move_to_end(text)
+            return rates
+    
+    data = json.loads(text)
+    valute = data.get('Valute') if isinstance(data, dict) else None
+    if not isinstance(valute, dict):
+        raise KeyError("В ответе API отсутствуют курсы валют")
+    rates = {code: item['Value'] for code, item in valute.items()}
+    with _rate_snapshots_lock:
+        _rate_snapshots[text] = rates
+        if len(_rate_snapshots) > _RATE_SNAPSHOTS_SIZE:
+            _rate_snapshots.popitem(last=False)
+    return rates
+
+
+def extract_rates_from_text(text, currency_codes):
+    """
+    Извлекает курсы запрошенных валют из текста ответа через общий снимок
+    
+    Текст разбирается полностью только при первой встрече; дальше запрос
+    курсов — поиск готового индекса {код: курс} и обращения к словарю
+    (см. _indexed_rates). Ключи вне Valute не учитываются.
+    
+    Args:
+        text (str | bytes): Текст ответа API (bytes — в UTF-8, без декодирования
+                            при повторных вызовах)
+        currency_codes (list): Список кодов валют
+    
+    Returns:
+        dict: Словарь {код: курс}
+    
+    Raises:
+        KeyError: Если в ответе нет курсов или запрошенной валюты
+    """
+    rates = _indexed_rates(text)
+    currencies = {}
+    for code in currency_codes:
+        rate = rates.get(code.upper())
+        if rate is None:
+            raise KeyError(f"Валюта {code} не найдена в ответе API")
+        currencies[code] = rate
+    
+    return currencies
+
+
+def benchmark_extraction(text, currency_codes, runs=1000):
+    """
+    Сравнивает пропускную способность полного и частичного разбора ответа
+    
+    Args:
+        text (str): Текст ответа API
+        currency_codes (list): Список кодов валют
+        runs (int): Количество повторов для каждого способа
+    
+    Returns:
+        dict: Количество извлечений в секунду: full — полный разбор каждый раз,
+              partial — через общий снимок (документ уже разобран),
+              partial_cold — через снимок, который каждый раз строится заново
+    """
+    def cold():
+        with _rate_snapshots_lock:
+            _rate_snapshots.clear()
+        extract_rates_from_text(text, currency_codes)
+    
+    full_time = timeit.timeit(lambda: extract_rates(json.loads(text), currency_codes), number=runs)
+    extract_rates_from_text(text, currency_codes)
+    partial_time = timeit.timeit(lambda: extract_rates_from_text(text, currency_codes), number=runs)
+    cold_time = timeit.timeit(cold, number=runs)
+    return {'full': runs / full_time, 'partial': runs / partial_time, 'partial_cold': runs / cold_time}
+
+
+@log_errors(currency_logger)
+def get_currencies(currency_codes, url=DAILY_URL,
+                   session=None, timeout=DEFAULT_TIMEOUT, cache=None, partial=False, breaker=None,
+                   coalescer=None):
+    """
+    Получает курсы валют из API ЦБ РФ
+    
+    Args:
+        currency_codes (list): Список кодов валют (например, ['USD', 'EUR'])
+        url (str): URL API ЦБ РФ
+        session (requests.Session): Сессия для запроса (по умолчанию общая currency_session)
+        timeout (float | tuple): Таймаут запроса: число или пара (подключение, чтение)
+        cache (RatesCache): Кэш ответов (например, currency_cache); None — без кэширования
+        partial (bool): Извлекать курсы через общий разобранный снимок документа
+                        (см. extract_rates_from_text); несовместим с cache, breaker и coalescer
+        breaker (CircuitBreaker): Выключатель (например, currency_breaker); None — без него
+        coalescer (RequestCoalescer): Объединитель одновременных запросов
+                                      (например, currency_coalescer); None — без него
+    
+    Returns:
+        dict: Словарь с курсами валют или None в случае ошибки. Во время сбоя API
+              с выключателем возвращается StaleRates из последнего успешного снимка
+    """
+    if not currency_codes:
+        raise ValueError("Список кодов валют не может быть пустым")
+    if partial and (cache is not None or breaker is not None or coalescer is not None):
+        raise ValueError("partial=True несовместим с cache, breaker и coalescer")
+    
+    def fetch():
+        return fetch_rates_document(url, session, timeout, cache)
+    
+    if breaker is not None:
+        # Выключатель работает внутри объединенного запроса: исход одного запроса
+        # к API учитывается один раз (ведущим), а не каждым ожидающим вызовом
+        guarded_fetch = lambda: breaker.call(url, fetch)
+        if coalescer is not None:
+            # Результат здесь — кортеж выключателя, поэтому ключ отличается от URL
+            data, stale, fetched_at = coalescer.get((url, breaker), guarded_fetch)
+        else:
+            data, stale, fetched_at = guarded_fetch()
+        with get_metrics().span('extract'):
+            rates = extract_rates(data, currency_codes)
+        return StaleRates(rates, fetched_at) if stale else rates
+    
+    if partial:
+        response = download(session or currency_session, url, timeout)
+        response.raise_for_status()
+        # Тело в UTF-8 передается как bytes: на повторном документе нет даже декодирования
+        # (и автоопределения кодировки, которое дороже самого разбора)
+        text = response.content
+        if response.encoding and codecs.lookup(response.encoding).name != 'utf-8':
+            text = text.decode(response.encoding)
+        with get_metrics().span('extract'):
+            return extract_rates_from_text(text, currency_codes)
+    
+    data = coalescer.get(url, fetch) if coalescer is not None else fetch()
+    with get_metrics().span('extract'):
+        return extract_rates(data, currency_codes)
+
+
+def _fetch_archive_day(day, archive_url, session, timeout):
+    """Загружает архивный документ за дату; None, если документа нет (404)"""
+    try:
+        return fetch_rates_document(archive_url.format(date=day), session, timeout)
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return None
+        raise
+
+
+@log_errors(currency_logger)
+def get_currency_history(currency_codes, start, end, store=None, archive_url=ARCHIVE_URL,
+                         session=None, timeout=DEFAULT_TIMEOUT, max_workers=8):
+    """
+    Получает историю курсов валют за диапазон дат
+    
+    Загружаются только даты, которых еще нет в локальном хранилище; загрузка
+    выполняется параллельно в пуле потоков через общую сессию.
+    
+    Args:
+        currency_codes (list): Список кодов валют
+        start (date): Начальная дата (включительно)
+        end (date): Конечная дата (включительно)
+        store (HistoryStore): Хранилище (по умолчанию файл DEFAULT_HISTORY_PATH)
+        archive_url (str): Шаблон URL архива с полем {date}
+        session (requests.Session): Сессия для запросов (по умолчанию общая currency_session)
+        timeout (float | tuple): Таймаут каждого запроса
+        max_workers (int): Количество потоков загрузки
+    
+    Returns:
+        dict: Словарь {код: RateSeries} или None в случае ошибки
+    """
+    if not currency_codes:
+        raise ValueError("Список кодов валют не может быть пустым")
+    if start > end:
+        raise ValueError("Начальная дата не может быть позже конечной")
+    
+    own_store = store is None
+    if own_store:
+        store = HistoryStore()
+    
+    try:
+        missing = store.missing_days(start, end)
+        if missing:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                documents = pool.map(
+                    lambda day: _fetch_archive_day(day, archive_url, session, timeout), missing
+                )
+                for day, data in zip(missing, documents):
+                    store.save_day(day, data)
+        
+        history = {code: store.series(code, start, end) for code in currency_codes}
+        if store.has_rates(start, end):
+            for code, series in history.items():
+                if not series:
+                    raise KeyError(f"Валюта {code} не найдена в архиве")
+        return history
+    finally:
+        if own_store:
+            store.close()
+
+
+# Таблицы курсов, построенные для последнего снимка каждого URL
+_rate_tables = {}
+
+
+@log_errors(currency_logger)
+def get_rate_table(url=DAILY_URL, session=None, timeout=DEFAULT_TIMEOUT, cache=None):
+    """
+    Получает таблицу курсов RateTable для конвертации между валютами
+    
+    При использовании кэша таблица строится один раз для каждого снимка
+    и переиспользуется, пока кэш возвращает тот же документ.
+    
+    Args:
+        url (str): URL API ЦБ РФ
+        session (requests.Session): Сессия для запроса (по умолчанию общая currency_session)
+        timeout (float | tuple): Таймаут запроса
+        cache (RatesCache): Кэш ответов; None — без кэширования
+    
+    Returns:
+        RateTable: Таблица курсов или None в случае ошибки
+    """
+    data = fetch_rates_document(url, session, timeout, cache)
+    cached = _rate_tables.get(url)
+    if cached is not None and cached[0] is data:
+        return cached[1]
+    
+    table = RateTable.from_document(data)
+    _rate_tables[url] = (data, table)
+    return table
+
+
+@log_errors_async(currency_logger)
+async def async_get_currencies(currency_codes, dates=None, url=DAILY_URL, archive_url=ARCHIVE_URL,
+                               session=None, timeout=DEFAULT_TIMEOUT, cache=None, max_concurrency=8):
+    """
+    Асинхронно получает курсы валют, не блокируя цикл событий
+    
+    Запросы выполняются через общую сессию с пулом соединений в потоках
+    исполнителя; одновременно выполняется не более max_concurrency запросов.
+    
+    Args:
+        currency_codes (list): Список кодов валют
+        dates (list): Даты для загрузки из архива (datetime.date); None в списке
+                      означает текущий документ url. Если dates не задан,
+                      загружается только текущий документ
+        url (str): URL текущего документа
+        archive_url (str): Шаблон URL архива с полем {date}
+        session (requests.Session): Сессия для запросов (по умолчанию общая currency_session)
+        timeout (float | tuple): Таймаут каждого запроса
+        cache (RatesCache): Кэш ответов; None — без кэширования
+        max_concurrency (int): Максимальное число одновременных запросов
+    
+    Returns:
+        dict: Словарь {код: курс}, если dates не задан, иначе {дата: {код: курс}};
+              None в случае ошибки
+    """
+    if not currency_codes:
+        raise ValueError("Список кодов валют не может быть пустым")
+    
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def fetch(date):
+        target = url if date is None else archive_url.format(date=date)
+        async with semaphore:
+            data = await loop.run_in_executor(
+                None, partial(fetch_rates_document, target, session, timeout, cache)
+            )
+        return extract_rates(data, currency_codes)
+    
+    if dates is None:
+        return await fetch(None)
+    
+    dates = list(dates)
+    results = await asyncio.gather(*(fetch(date) for date in dates))
+    return dict(zip(dates, results))
+
+
 # Пример использования
 if __name__ == "__main__":
     # Тестирование функции
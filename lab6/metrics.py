@@ -0,0 +1,188 @@
+"""
+Метрики для получения курсов валют.
+
+Модуль предоставляет подключаемую поверхность метрик: замеры длительности
+фаз запроса (span), счетчики ошибок и обращений к кэшу. По умолчанию
+используется NullMetrics без накладных расходов; Metrics накапливает значения
+и выводит их в текстовом формате Prometheus, в том числе через локальный
+HTTP-эндпоинт /metrics.
+"""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class NullMetrics:
+    """Метрики по умолчанию: все операции ничего не делают"""
+
+    _span = nullcontext()
+
+    def span(self, name):
+        return self._span
+
+    def increment(self, name, labels=None, value=1):
+        pass
+
+    def observe(self, name, value, labels=None):
+        pass
+
+
+class Metrics:
+    """
+    Накопитель метрик в памяти процесса
+
+    Счетчики и сводки (count/sum) хранятся по паре (имя, метки). Фазы
+    запроса записываются в сводку phase_seconds с меткой phase.
+    """
+
+    def __init__(self, prefix='currency_'):
+        """
+        Args:
+            prefix (str): Префикс имен метрик при выводе
+        """
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._summaries = {}
+
+    @contextmanager
+    def span(self, name):
+        """Замеряет длительность блока как фазу name"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('phase_seconds', time.perf_counter() - started, {'phase': name})
+
+    def increment(self, name, labels=None, value=1):
+        """Увеличивает счетчик name с метками labels"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=None):
+        """Добавляет наблюдение value в сводку name"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            count, total = self._summaries.get(key, (0, 0.0))
+            self._summaries[key] = (count + 1, total + value)
+
+    def counter(self, name, labels=None):
+        """Возвращает текущее значение счетчика"""
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0)
+
+    def summary(self, name, labels=None):
+        """Возвращает (count, sum) сводки"""
+        with self._lock:
+            return self._summaries.get((name, _label_key(labels)), (0, 0.0))
+
+    def cache_hit_ratio(self):
+        """Доля попаданий среди обращений к кэшу (по счетчику cache_requests_total)"""
+        with self._lock:
+            results = {
+                dict(labels).get('result'): value
+                for (name, labels), value in self._counters.items()
+                if name == 'cache_requests_total'
+            }
+        total = sum(results.values())
+        return results.get('hit', 0) / total if total else 0.0
+
+    def render(self):
+        """Выводит все метрики в текстовом формате Prometheus"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            summaries = sorted(self._summaries.items())
+
+        lines = []
+        declared = set()
+        for (name, labels), value in counters:
+            full_name = self.prefix + name
+            if full_name not in declared:
+                lines.append(f'# TYPE {full_name} counter')
+                declared.add(full_name)
+            lines.append(f'{full_name}{_format_labels(labels)} {value}')
+        for (name, labels), (count, total) in summaries:
+            full_name = self.prefix + name
+            if full_name not in declared:
+                lines.append(f'# TYPE {full_name} summary')
+                declared.add(full_name)
+            lines.append(f'{full_name}_count{_format_labels(labels)} {count}')
+            lines.append(f'{full_name}_sum{_format_labels(labels)} {total:.9f}')
+        if any(name == 'cache_requests_total' for (name, _), _ in counters):
+            lines.append(f'# TYPE {self.prefix}cache_hit_ratio gauge')
+            lines.append(f'{self.prefix}cache_hit_ratio {self.cache_hit_ratio():.6f}')
+        return '\n'.join(lines) + '\n'
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '%s="%s"' % (key, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+        for key, value in labels
+    )
+    return '{' + pairs + '}'
+
+
+# Текущая реализация метрик (заменяется через set_metrics)
+_metrics = NullMetrics()
+
+
+def get_metrics():
+    """Возвращает текущую реализацию метрик"""
+    return _metrics
+
+
+def set_metrics(metrics):
+    """
+    Устанавливает реализацию метрик
+
+    Args:
+        metrics: Metrics, NullMetrics или объект с теми же методами; None — NullMetrics
+
+    Returns:
+        Предыдущая реализация
+    """
+    global _metrics
+    previous = _metrics
+    _metrics = metrics if metrics is not None else NullMetrics()
+    return previous
+
+
+def serve_metrics(metrics, host='127.0.0.1', port=0):
+    """
+    Запускает HTTP-эндпоинт /metrics в фоновом потоке
+
+    Args:
+        metrics (Metrics): Источник метрик
+        host (str): Адрес прослушивания
+        port (int): Порт (0 — выбрать свободный)
+
+    Returns:
+        ThreadingHTTPServer: Сервер; адрес — server.server_address, остановка — server.shutdown()
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
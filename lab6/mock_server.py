@@ -0,0 +1,186 @@
+"""
+Локальный имитатор API ЦБ РФ для тестов и нагрузочного тестирования.
+
+Сервер на стандартной библиотеке отдает записанный документ daily_json.js
+(fixtures/daily_json.js) по любому пути, в том числе по путям архива (или
+документы архива, заданные функцией archive), поддерживает keep-alive
+соединения, ETag/If-None-Match и позволяет задавать задержку ответа,
+долю ошибок и размер документа.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from datetime import date
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+# Записанный ответ API ЦБ РФ
+SAMPLE_PAYLOAD_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'daily_json.js')
+
+
+def load_payload(path=SAMPLE_PAYLOAD_PATH, extra_currencies=0):
+    """
+    Загружает записанный документ и при необходимости увеличивает его размер
+
+    Args:
+        path (str): Путь к JSON-документу в формате daily_json.js
+        extra_currencies (int): Количество дополнительных синтетических валют
+                                (коды X000, X001, ...)
+
+    Returns:
+        dict: Документ
+    """
+    with open(path, encoding='utf-8') as f:
+        payload = json.load(f)
+    for i in range(extra_currencies):
+        code = f'X{i:03d}'
+        payload['Valute'][code] = {
+            'ID': f'R9{i:04d}', 'NumCode': f'{900 + i % 100:03d}', 'CharCode': code,
+            'Nominal': 1, 'Name': f'Синтетическая валюта {i}',
+            'Value': round(1 + i * 0.37, 4), 'Previous': round(1 + i * 0.36, 4)
+        }
+    return payload
+
+
+class _MockCBRHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Заголовки и тело пишутся отдельно: без TCP_NODELAY каждый ответ ждет задержанного ACK
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.mock.lock:
+            self.server.mock.connections += 1
+
+    def do_GET(self):
+        mock = self.server.mock
+        with mock.lock:
+            mock.requests += 1
+            mock.active += 1
+            mock.max_active = max(mock.max_active, mock.active)
+            fail = mock.requests <= mock.fail_first or mock.random.random() < mock.error_rate
+        try:
+            delay = mock.latency + (mock.random.uniform(0, mock.jitter) if mock.jitter else 0)
+            if delay:
+                time.sleep(delay)
+            if fail:
+                with mock.lock:
+                    mock.errors += 1
+                self._send(mock.error_status, b'{}')
+            elif mock.archive is not None and self.path.startswith('/archive/'):
+                self._send_archive(mock.archive)
+            elif self.headers.get('If-None-Match') == mock.etag:
+                self._send(304, b'')
+            else:
+                self._send(200, mock.body)
+        finally:
+            with mock.lock:
+                mock.active -= 1
+
+    def _send_archive(self, archive):
+        """Архив: /archive/ГГГГ/ММ/ДД/daily_json.js; 404, если документа за дату нет"""
+        try:
+            year, month, day = (int(part) for part in self.path.split('/')[2:5])
+            payload = archive(date(year, month, day))
+        except ValueError:
+            payload = None
+        if payload is None:
+            self._send(404, b'{}')
+            return
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self._send(200, body, '"%08x"' % zlib.crc32(body))
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/javascript; charset=utf-8')
+        self.send_header('ETag', etag or self.server.mock.etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockCBRServer:
+    """
+    Имитатор API ЦБ РФ в фоновом потоке
+
+    Пример:
+        >>> with MockCBRServer(latency=0.01) as server:
+        ...     get_currencies(['USD'], url=server.url)
+        {'USD': 91.7791}
+    """
+
+    def __init__(self, payload=None, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503,
+                 fail_first=0, extra_currencies=0, archive=None, host='127.0.0.1', port=0, seed=None):
+        """
+        Args:
+            payload (dict): Документ для ответа (по умолчанию fixtures/daily_json.js)
+            latency (float): Задержка каждого ответа в секундах
+            jitter (float): Случайная добавка к задержке [0, jitter] секунд
+            error_rate (float): Доля ответов с ошибкой error_status
+            error_status (int): HTTP-код ошибочного ответа
+            fail_first (int): Количество первых запросов, завершающихся ошибкой
+            extra_currencies (int): Дополнительные валюты для увеличения документа
+            archive (Callable): Документ архива за дату: archive(date) -> dict или None (ответ 404);
+                                по умолчанию по путям архива отдается тот же документ
+            host (str): Адрес прослушивания
+            port (int): Порт (0 — выбрать свободный)
+            seed (int): Начальное значение генератора случайных ошибок и задержек
+        """
+        if payload is None:
+            payload = load_payload(extra_currencies=extra_currencies)
+        self.body = json.dumps(payload, ensure_ascii=False, indent=4).encode('utf-8')
+        self.etag = '"%08x"' % zlib.crc32(self.body)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.fail_first = fail_first
+        self.archive = archive
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.connections = 0
+        self.active = 0
+        self.max_active = 0
+        self._httpd = ThreadingHTTPServer((host, port), _MockCBRHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def url(self):
+        """URL текущего документа"""
+        return f'{self.base_url}/daily_json.js'
+
+    @property
+    def archive_url(self):
+        """Шаблон URL архива (для async_get_currencies и get_currency_history)"""
+        return self.base_url + '/archive/{date:%Y/%m/%d}/daily_json.js'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,249 @@
+"""
+Логирование с низкими накладными расходами.
+
+Записи ставятся в очередь без форматирования (LazyQueueHandler) и выводятся
+в фоновом потоке (RateLimitedQueueListener) с ограничением частоты по ключу
+ошибки (RateLimitFilter) и, при необходимости, в формате JSON (JsonFormatter).
+setup_queue_logging собирает эту цепочку, декоратор log_errors_lazy
+логирует ошибки с отложенной подстановкой аргументов.
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from functools import wraps
+
+import requests
+from metrics import get_metrics
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler без форматирования в потоке вызова
+    
+    Стандартный QueueHandler.prepare форматирует сообщение до постановки
+    в очередь; здесь запись передается как есть, и подстановка аргументов
+    выполняется в потоке QueueListener.
+    """
+    
+    def prepare(self, record):
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Ограничение частоты записей по ключу ошибки
+    
+    В каждом окне interval секунд по ключу пропускается не более burst записей,
+    остальные отбрасываются. Число отброшенных записей сообщается сводкой:
+    копией последней отброшенной записи с атрибутом suppressed и пометкой
+    в сообщении. Если задан emit, сводка передается в него по истечении окна
+    (по таймеру) и при flush(); иначе число отброшенных получает первая
+    запись следующего окна. Ключ берется из атрибута error_key записи,
+    иначе — шаблон сообщения.
+    """
+    
+    def __init__(self, burst=5, interval=60.0, clock=time.monotonic, emit=None):
+        """
+        Args:
+            burst (int): Максимум записей по одному ключу в окне
+            interval (float): Длина окна в секундах
+            clock (Callable): Источник времени окон
+            emit (Callable): Получатель сводок (например, QueueHandler.enqueue)
+        """
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self._clock = clock
+        self._emit = emit
+        self._lock = threading.Lock()
+        # ключ -> [начало окна, пропущено, отброшено, последняя отброшенная запись, таймер]
+        self._windows = {}
+    
+    @staticmethod
+    def _mark(record, suppressed):
+        record.suppressed = suppressed
+        if suppressed:
+            record.msg = f"{record.msg} (подавлено повторов: %d)"
+            record.args = (record.args or ()) + (suppressed,)
+        return record
+    
+    def _take_summary(self, window):
+        """Забирает сводку окна (вызывается под блокировкой)"""
+        if not window[2]:
+            return None
+        summary = logging.makeLogRecord(dict(window[3].__dict__))
+        self._mark(summary, window[2])
+        window[2] = 0
+        window[3] = None
+        if window[4] is not None:
+            window[4].cancel()
+            window[4] = None
+        return summary
+    
+    def _expire(self, key, started):
+        """Выводит сводку окна по истечении его срока (поток таймера)"""
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or window[0] != started:
+                return
+            window[4] = None
+            summary = self._take_summary(window)
+        if summary is not None:
+            self._emit(summary)
+    
+    def filter(self, record):
+        key = getattr(record, 'error_key', None) or (record.name, record.msg)
+        now = self._clock()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window is not None else 0
+                if window is not None and window[4] is not None:
+                    window[4].cancel()
+                self._windows[key] = [now, 1, 0, None, None]
+            elif window[1] < self.burst:
+                window[1] += 1
+                suppressed = 0
+            else:
+                window[2] += 1
+                window[3] = record
+                if self._emit is not None and window[4] is None:
+                    timer = threading.Timer(window[0] + self.interval - now, self._expire, (key, window[0]))
+                    timer.daemon = True
+                    window[4] = timer
+                    timer.start()
+                return False
+        
+        self._mark(record, suppressed)
+        return True
+    
+    def flush(self):
+        """
+        Сводки по всем ключам с отброшенными записями, не дожидаясь конца окон
+        
+        Returns:
+            list: Записи-сводки (при заданном emit они также переданы в него)
+        """
+        with self._lock:
+            summaries = [self._take_summary(window) for window in self._windows.values()]
+        summaries = [summary for summary in summaries if summary is not None]
+        if self._emit is not None:
+            for summary in summaries:
+                self._emit(summary)
+        return summaries
+
+
+class RateLimitedQueueListener(logging.handlers.QueueListener):
+    """QueueListener, который при остановке выводит отложенные сводки RateLimitFilter"""
+    
+    def __init__(self, queue, *handlers, rate_filter=None):
+        super().__init__(queue, *handlers)
+        self.rate_filter = rate_filter
+    
+    def flush(self):
+        """Ставит в очередь сводки отброшенных записей"""
+        if self.rate_filter is not None:
+            self.rate_filter.flush()
+    
+    def stop(self):
+        self.flush()
+        super().stop()
+
+
+class JsonFormatter(logging.Formatter):
+    """Форматирует запись в одну строку JSON (включая задержку вызова)"""
+    
+    FIELDS = ('function', 'error_type', 'latency_ms', 'suppressed')
+    
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record),
+            'logger': record.name,
+            'level': record.levelname,
+            'message': record.getMessage(),
+        }
+        for field in self.FIELDS:
+            if hasattr(record, field):
+                payload[field] = getattr(record, field)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def setup_queue_logging(name='currency_api', stream=None, structured=False, burst=5, interval=60.0):
+    """
+    Настройка логирования с выводом в отдельном потоке
+    
+    Записи ставятся в очередь (LazyQueueHandler) с ограничением частоты
+    (RateLimitFilter), а форматирование и запись в поток выполняет
+    QueueListener в фоновом потоке.
+    
+    Args:
+        name (str): Имя логгера (его текущие обработчики заменяются)
+        stream: Поток вывода (по умолчанию sys.stdout)
+        structured (bool): Выводить записи в формате JSON
+        burst (int): Максимум записей по одному ключу ошибки в окне
+        interval (float): Длина окна ограничения частоты в секундах
+    
+    Returns:
+        tuple: (logger, listener); listener.stop() выводит сводки отброшенных записей,
+               дописывает очередь и останавливает поток
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.ERROR)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    
+    if structured:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(formatter)
+    
+    records = queue.SimpleQueue()
+    queue_handler = LazyQueueHandler(records)
+    # Сводки отброшенных записей минуют фильтр и сразу ставятся в очередь
+    rate_filter = RateLimitFilter(burst, interval, emit=queue_handler.enqueue)
+    queue_handler.addFilter(rate_filter)
+    logger.addHandler(queue_handler)
+    
+    listener = RateLimitedQueueListener(records, output, rate_filter=rate_filter)
+    listener.start()
+    return logger, listener
+
+
+def log_errors_lazy(logger):
+    """
+    Декоратор для логирования ошибок с отложенным форматированием
+    
+    Семантика как у log_errors, но сообщение передается в %-стиле (аргументы
+    подставляются только если запись будет выведена), а в запись добавляются
+    поля function, error_type, latency_ms и ключ error_key для ограничения частоты.
+    """
+    def decorator(func):
+        name = func.__name__
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except (requests.RequestException, KeyError, ValueError) as e:
+                error_type = type(e).__name__
+                get_metrics().increment('errors_total', {'function': name, 'type': error_type})
+                logger.error(
+                    "Ошибка в функции %s: %s", name, e,
+                    extra={
+                        'function': name,
+                        'error_type': error_type,
+                        'error_key': f"{name}:{error_type}",
+                        'latency_ms': round((time.perf_counter() - started) * 1000, 3),
+                    }
+                )
+                return None
+        return wrapper
+    return decorator
@@ -0,0 +1,117 @@
+"""
+Таблица курсов для конвертации между валютами одного снимка.
+"""
+
+from array import array
+
+
+class RateTable:
+    """
+    Таблица курсов для конвертации между любыми валютами одного снимка
+    
+    Хранит курс одной единицы каждой валюты в рублях (Value / Nominal)
+    в array('d') и словарь код → индекс. Рубль добавляется как базовая валюта.
+    """
+    
+    def __init__(self, rates, date=None):
+        """
+        Args:
+            rates (dict): Словарь {код: курс одной единицы в рублях}
+            date (str): Дата снимка из ответа API
+        """
+        self.date = date
+        self.index = {'RUB': 0}
+        self.rub_rates = array('d', [1.0])
+        for code, rate in rates.items():
+            code = code.upper()
+            if code not in self.index:
+                self.index[code] = len(self.rub_rates)
+                self.rub_rates.append(rate)
+            else:
+                self.rub_rates[self.index[code]] = rate
+    
+    @classmethod
+    def from_document(cls, data):
+        """
+        Строит таблицу из разобранного ответа API
+        
+        Raises:
+            KeyError: Если в ответе отсутствуют курсы валют
+        """
+        if 'Valute' not in data:
+            raise KeyError("В ответе API отсутствуют курсы валют")
+        rates = {
+            code: item['Value'] / item.get('Nominal', 1)
+            for code, item in data['Valute'].items()
+        }
+        return cls(rates, data.get('Date'))
+    
+    def __contains__(self, code):
+        return code.upper() in self.index
+    
+    def __len__(self):
+        return len(self.rub_rates)
+    
+    def _position(self, code):
+        try:
+            return self.index[code.upper()]
+        except KeyError:
+            raise KeyError(f"Валюта {code} не найдена в таблице курсов") from None
+    
+    def rate(self, from_code, to_code):
+        """Возвращает курс: сколько единиц to_code стоит одна единица from_code"""
+        return self.rub_rates[self._position(from_code)] / self.rub_rates[self._position(to_code)]
+    
+    def convert(self, amount, from_code, to_code):
+        """
+        Конвертирует сумму из одной валюты в другую
+        
+        Args:
+            amount (float): Сумма в валюте from_code
+            from_code (str): Код исходной валюты
+            to_code (str): Код целевой валюты
+        
+        Returns:
+            float: Сумма в валюте to_code
+        """
+        return amount * self.rate(from_code, to_code)
+    
+    def convert_many(self, amounts, from_codes, to_codes):
+        """
+        Конвертирует пакет сумм (векторы одинаковой длины)
+        
+        Коды переводятся в индексы один раз для каждого уникального кода,
+        затем суммы пересчитываются векторно NumPy: amounts * rub[src] / rub[dst].
+        Без NumPy суммы пересчитываются одним проходом по массивам.
+        
+        Args:
+            amounts (Iterable[float]): Суммы
+            from_codes (Iterable[str]): Коды исходных валют
+            to_codes (Iterable[str]): Коды целевых валют
+        
+        Returns:
+            numpy.ndarray: Суммы в целевых валютах (float64; без NumPy — array('d'))
+        
+        Raises:
+            ValueError: Если длины входных последовательностей различаются
+        """
+        amounts = array('d', amounts)
+        from_codes = list(from_codes)
+        to_codes = list(to_codes)
+        if not len(amounts) == len(from_codes) == len(to_codes):
+            raise ValueError("Длины amounts, from_codes и to_codes должны совпадать")
+        
+        positions = {code: self._position(code) for code in set(from_codes) | set(to_codes)}
+        src = array('q', (positions[code] for code in from_codes))
+        dst = array('q', (positions[code] for code in to_codes))
+        try:
+            import numpy as np
+        except ImportError:
+            rub = self.rub_rates
+            return array('d', (amount * rub[i] / rub[j] for amount, i, j in zip(amounts, src, dst)))
+        
+        # Массивы array('d') передаются в NumPy без копирования
+        rub = np.frombuffer(self.rub_rates, dtype=np.float64)
+        src = np.frombuffer(src, dtype=np.int64)
+        dst = np.frombuffer(dst, dtype=np.int64)
+        return np.frombuffer(amounts, dtype=np.float64) * rub[src] / rub[dst]
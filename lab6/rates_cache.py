@@ -0,0 +1,146 @@
+"""
+Кэш ответов API ЦБ РФ в памяти процесса.
+
+Срок жизни записи вычисляется по полям ответа, просроченная запись
+перепроверяется условным запросом (ETag / If-Modified-Since).
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from metrics import get_metrics
+from transport import DEFAULT_TIMEOUT, download, parse_document
+
+
+class RatesCache:
+    """
+    Кэш ответов API ЦБ РФ в памяти процесса (ключ — URL)
+    
+    Срок жизни записи вычисляется по полям ответа: NextDate, если есть,
+    иначе Timestamp + 1 день, с ограничением [min_ttl, max_ttl]. Просроченная
+    запись перепроверяется условным запросом (If-None-Match / If-Modified-Since),
+    и при ответе 304 используется сохраненный документ. Одновременные вызовы
+    для одного URL выполняют только один запрос (single-flight).
+    """
+    
+    def __init__(self, min_ttl=60, max_ttl=86400, clock=time.time):
+        """
+        Args:
+            min_ttl (float): Минимальный срок жизни записи в секундах
+            max_ttl (float): Максимальный срок жизни записи в секундах
+            clock (Callable): Источник текущего времени (для тестов)
+        """
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self._clock = clock
+        self._entries = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+    
+    def get(self, url, session, timeout=DEFAULT_TIMEOUT):
+        """
+        Возвращает разобранный JSON-документ по URL из кэша или из сети
+        
+        Args:
+            url (str): URL API ЦБ РФ
+            session (requests.Session): Сессия для запроса
+            timeout (float | tuple): Таймаут запроса
+        
+        Returns:
+            dict: Разобранный ответ API
+        """
+        data = self._fresh(url)
+        if data is not None:
+            return data
+        
+        with self._lock_for(url):
+            # Пока ждали блокировку, запись мог обновить другой поток
+            data = self._fresh(url)
+            if data is not None:
+                return data
+            
+            entry = self._entries.get(url)
+            headers = {}
+            if entry is not None:
+                if entry['etag']:
+                    headers['If-None-Match'] = entry['etag']
+                if entry['last_modified']:
+                    headers['If-Modified-Since'] = entry['last_modified']
+            
+            response = download(session, url, timeout, headers)
+            if response.status_code == 304 and entry is not None:
+                data = entry['data']
+                self._count('revalidations')
+            else:
+                response.raise_for_status()
+                # Ответ, который не является JSON-объектом, не кэшируется
+                data = parse_document(response)
+                entry = {'etag': None, 'last_modified': None}
+                self._count('misses')
+            
+            self._entries[url] = {
+                'data': data,
+                'expires_at': self._clock() + self._ttl(data),
+                'etag': response.headers.get('ETag') or entry['etag'],
+                'last_modified': response.headers.get('Last-Modified') or entry['last_modified'],
+            }
+            return data
+    
+    def stats(self):
+        """Возвращает счетчики попаданий, промахов и перепроверок"""
+        with self._guard:
+            total = self.hits + self.misses + self.revalidations
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+                'hit_ratio': self.hits / total if total else 0.0,
+            }
+    
+    def clear(self):
+        """Очищает кэш и сбрасывает счетчики"""
+        with self._guard:
+            self._entries.clear()
+            self.hits = self.misses = self.revalidations = 0
+    
+    def _fresh(self, url):
+        """Возвращает данные непросроченной записи или None"""
+        entry = self._entries.get(url)
+        if entry is not None and entry['expires_at'] > self._clock():
+            self._count('hits')
+            return entry['data']
+        return None
+    
+    def _lock_for(self, url):
+        """Возвращает блокировку для URL (создается при первом обращении)"""
+        with self._guard:
+            return self._locks.setdefault(url, threading.Lock())
+    
+    # Значения метки result в метрике cache_requests_total
+    _METRIC_RESULTS = {'hits': 'hit', 'misses': 'miss', 'revalidations': 'revalidation'}
+    
+    def _count(self, name):
+        with self._guard:
+            setattr(self, name, getattr(self, name) + 1)
+        get_metrics().increment('cache_requests_total', {'result': self._METRIC_RESULTS[name]})
+    
+    def _ttl(self, data):
+        """Вычисляет срок жизни записи по полям NextDate / Timestamp ответа"""
+        expires = None
+        if not isinstance(data, dict):
+            return self.min_ttl
+        try:
+            if data.get('NextDate'):
+                expires = datetime.fromisoformat(data['NextDate'])
+            elif data.get('Timestamp'):
+                expires = datetime.fromisoformat(data['Timestamp']) + timedelta(days=1)
+        except (TypeError, ValueError):
+            expires = None
+        if expires is None or expires.tzinfo is None:
+            return self.min_ttl
+        ttl = expires.timestamp() - self._clock()
+        return min(max(ttl, self.min_ttl), self.max_ttl)
@@ -1,9 +1,27 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import sys
+import json
+import time
+import os
+import tempfile
+from datetime import date, timedelta
 import logging
+import threading
+import queue
 from io import StringIO
-from main import get_currencies, setup_logging
+from main import (
+    get_currencies, async_get_currencies, get_currency_history,
+    extract_rates, extract_rates_from_text, benchmark_extraction, get_rate_table,
+    setup_logging, setup_queue_logging, log_errors_lazy, RateLimitFilter,
+    create_session, RatesCache, HistoryStore, RateTable, CircuitBreaker, CircuitOpenError,
+    RequestCoalescer
+)
+from metrics import Metrics, NullMetrics, set_metrics, serve_metrics
+from mock_server import MockCBRServer
+from load_test import run_load_test, run_async_load_test, percentile
+import requests
+import urllib.request
 
 
 class TestCurrencyAPI(unittest.TestCase):
@@ -24,7 +42,7 @@ class TestCurrencyAPI(unittest.TestCase):
             }
         }
         
-        with patch('main.requests.get') as mock_get:
+        with patch('main.currency_session.get') as mock_get:
             mock_get.return_value.status_code = 200
             mock_get.return_value.json.return_value = mock_response
             
@@ -42,7 +60,7 @@ class TestCurrencyAPI(unittest.TestCase):
             }
         }
         
-        with patch('main.requests.get') as mock_get:
+        with patch('main.currency_session.get') as mock_get:
             mock_get.return_value.status_code = 200
             mock_get.return_value.json.return_value = mock_response
             
@@ -53,7 +71,7 @@ class TestCurrencyAPI(unittest.TestCase):
         """Тест ответа без курсов валют"""
         mock_response = {}  # Нет ключа 'Valute'
         
-        with patch('main.requests.get') as mock_get:
+        with patch('main.currency_session.get') as mock_get:
             mock_get.return_value.status_code = 200
             mock_get.return_value.json.return_value = mock_response
             
@@ -62,7 +80,7 @@ class TestCurrencyAPI(unittest.TestCase):
     
     def test_network_error(self):
         """Тест обработки сетевой ошибки"""
-        with patch('main.requests.get') as mock_get:
+        with patch('main.currency_session.get') as mock_get:
             mock_get.side_effect = Exception("Network error")
             
             result = get_currencies(self.currency_codes)
@@ -82,7 +100,7 @@ class TestCurrencyAPI(unittest.TestCase):
             }
         }
         
-        with patch('main.requests.get') as mock_get:
+        with patch('main.currency_session.get') as mock_get:
             mock_get.return_value.status_code = 200
             mock_get.return_value.json.return_value = mock_response
             
@@ -97,7 +115,7 @@ class TestCurrencyAPI(unittest.TestCase):
         
         # Перехватываем вывод логов
         with patch('sys.stdout') as mock_stdout:
-            with patch('main.requests.get') as mock_get:
+            with patch('main.currency_session.get') as mock_get:
                 mock_get.side_effect = Exception("Test error")
                 
                 result = get_currencies(self.currency_codes)
@@ -107,6 +125,750 @@ class TestCurrencyAPI(unittest.TestCase):
                 self.assertTrue(mock_stdout.write.called)
 
 
+class TestLazyLogging(unittest.TestCase):
+    """Тесты логирования через очередь с ограничением частоты"""
+
+    def make_failing(self, logger, error=KeyError):
+        @log_errors_lazy(logger)
+        def failing(code):
+            raise error(f"Валюта {code} не найдена в ответе API")
+        return failing
+
+    def test_rate_limited_output(self):
+        """По одному ключу ошибки выводится не более burst записей за окно"""
+        stream = StringIO()
+        logger, listener = setup_queue_logging('currency_api.test_rate', stream=stream, burst=2)
+        failing = self.make_failing(logger)
+        results = [failing('XYZ') for _ in range(5)]
+        self.make_failing(logger, ValueError)('ABC')
+        listener.stop()
+
+        self.assertEqual(results, [None] * 5)
+        lines = stream.getvalue().splitlines()
+        # Две записи XYZ, запись ABC и сводка по XYZ, выведенная при остановке
+        self.assertEqual(len(lines), 4)
+        self.assertIn("Ошибка в функции failing: 'Валюта XYZ не найдена в ответе API'", lines[0])
+        self.assertIn("(подавлено повторов: 3)", lines[3])
+
+    def test_suppressed_summary(self):
+        """Первая запись нового окна сообщает число подавленных повторов"""
+        now = [0.0]
+        rate_filter = RateLimitFilter(burst=1, interval=10, clock=lambda: now[0])
+
+        def record():
+            return logging.LogRecord('x', logging.ERROR, __file__, 1, "Ошибка %s", ('a',), None)
+
+        self.assertTrue(rate_filter.filter(record()))
+        self.assertFalse(rate_filter.filter(record()))
+        self.assertFalse(rate_filter.filter(record()))
+        now[0] = 10
+        item = record()
+        self.assertTrue(rate_filter.filter(item))
+        self.assertEqual(item.suppressed, 2)
+        self.assertEqual(item.getMessage(), "Ошибка a (подавлено повторов: 2)")
+
+    def test_summary_on_window_expiry(self):
+        """Сводка выводится по истечении окна, даже если новых записей с тем же ключом нет"""
+        summaries = queue.SimpleQueue()
+        rate_filter = RateLimitFilter(burst=1, interval=0.05, emit=summaries.put)
+        record = lambda: logging.LogRecord('x', logging.ERROR, __file__, 1, "Ошибка %s", ('a',), None)
+        for _ in range(3):
+            rate_filter.filter(record())
+
+        summary = summaries.get(timeout=2)
+        self.assertEqual(summary.suppressed, 2)
+        self.assertEqual(summary.getMessage(), "Ошибка a (подавлено повторов: 2)")
+        # Следующая запись уже не повторяет сводку
+        time.sleep(0.05)
+        item = record()
+        self.assertTrue(rate_filter.filter(item))
+        self.assertEqual(item.suppressed, 0)
+        self.assertEqual(rate_filter.flush(), [])
+
+    def test_flush_reports_pending(self):
+        """flush() сообщает отброшенные записи, не дожидаясь конца окна"""
+        rate_filter = RateLimitFilter(burst=1, interval=60)
+        for _ in range(4):
+            rate_filter.filter(logging.LogRecord('x', logging.ERROR, __file__, 1, "Ошибка", None, None))
+        summaries = rate_filter.flush()
+        self.assertEqual([summary.suppressed for summary in summaries], [3])
+        self.assertEqual(rate_filter.flush(), [])
+
+    def test_structured_records(self):
+        """Структурированные записи содержат тип ошибки и задержку"""
+        stream = StringIO()
+        logger, listener = setup_queue_logging('currency_api.test_json', stream=stream, structured=True)
+        self.make_failing(logger, ValueError)('XYZ')
+        listener.stop()
+
+        record = json.loads(stream.getvalue())
+        self.assertEqual(record['function'], 'failing')
+        self.assertEqual(record['error_type'], 'ValueError')
+        self.assertGreaterEqual(record['latency_ms'], 0)
+        self.assertEqual(record['suppressed'], 0)
+
+
+# Небольшой документ для тестов, проверяющих значения курсов
+PAYLOAD = {'Valute': {'USD': {'Value': 75.5}, 'EUR': {'Value': 85.2}}}
+
+
+def weekday_archive(day):
+    """Архив для MockCBRServer: в выходные документа нет, курс USD — номер дня, EUR — номер дня + 100"""
+    if day.weekday() >= 5:
+        return None
+    return {'Valute': {
+        'USD': {'Value': float(day.day), 'Nominal': 1},
+        'EUR': {'Value': float(day.day + 100), 'Nominal': 1},
+    }}
+
+
+class TestCurrencySession(unittest.TestCase):
+    """Тесты пула соединений, таймаутов и повторов на локальном сервере"""
+
+    def setUp(self):
+        self.server = MockCBRServer(payload=PAYLOAD).start()
+        self.session = create_session(backoff_factor=0)
+
+    def tearDown(self):
+        self.session.close()
+        self.server.stop()
+
+    def test_connection_reused(self):
+        """Повторные вызовы используют одно keep-alive соединение"""
+        for _ in range(3):
+            result = get_currencies(['USD'], url=self.server.url, session=self.session)
+            self.assertEqual(result, {'USD': 75.5})
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_read_timeout(self):
+        """Медленный ответ прерывается по таймауту чтения и возвращается None"""
+        session = create_session(retries=0)
+        try:
+            with MockCBRServer(payload=PAYLOAD, latency=0.5) as server:
+                result = get_currencies(['USD'], url=server.url, session=session, timeout=(1, 0.1))
+        finally:
+            session.close()
+        self.assertIsNone(result)
+
+    def test_retry_on_server_error(self):
+        """Ответ 503 повторяется, и вызов завершается успешно"""
+        with MockCBRServer(payload=PAYLOAD, fail_first=1) as server:
+            result = get_currencies(['EUR'], url=server.url, session=self.session)
+        self.assertEqual(result, {'EUR': 85.2})
+        self.assertEqual(server.requests, 2)
+
+
+class TestRatesCache(unittest.TestCase):
+    """Тесты кэша курсов с TTL и условными запросами"""
+
+    def setUp(self):
+        self.server = MockCBRServer(payload=PAYLOAD).start()
+        self.url = self.server.url
+        self.session = create_session(backoff_factor=0)
+        self.now = [1000.0]
+        self.cache = RatesCache(min_ttl=60, clock=lambda: self.now[0])
+
+    def tearDown(self):
+        self.session.close()
+        self.server.stop()
+
+    def test_cache_hit(self):
+        """Повторный вызов в пределах TTL не обращается к серверу"""
+        for codes in (['USD'], ['EUR'], ['USD', 'EUR']):
+            get_currencies(codes, url=self.url, session=self.session, cache=self.cache)
+        self.assertEqual(self.server.requests, 1)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['revalidations']), (2, 1, 0))
+
+    def test_revalidation_after_ttl(self):
+        """После истечения TTL выполняется условный запрос, ответ 304 продлевает запись"""
+        get_currencies(['USD'], url=self.url, session=self.session, cache=self.cache)
+        self.now[0] += 61
+        result = get_currencies(['USD'], url=self.url, session=self.session, cache=self.cache)
+        self.assertEqual(result, {'USD': 75.5})
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(self.cache.stats()['revalidations'], 1)
+
+    def test_single_flight(self):
+        """Одновременные вызовы выполняют один запрос к серверу"""
+        results = []
+        with MockCBRServer(payload=PAYLOAD, latency=0.5) as server:
+            threads = [
+                threading.Thread(target=lambda: results.append(
+                    get_currencies(['USD'], url=server.url, session=self.session, cache=self.cache)))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(results, [{'USD': 75.5}] * 8)
+        self.assertEqual(server.requests, 1)
+
+    def test_ttl_from_payload(self):
+        """TTL берется из NextDate, а при его отсутствии — из Timestamp + 1 день"""
+        cache = RatesCache(min_ttl=60, max_ttl=10 ** 9, clock=lambda: 0)
+        self.assertEqual(cache._ttl({'NextDate': '1970-01-01T01:00:00+00:00'}), 3600)
+        self.assertEqual(cache._ttl({'Timestamp': '1970-01-01T00:00:00+00:00'}), 86400)
+        self.assertEqual(cache._ttl({}), 60)
+        self.assertEqual(cache._ttl([]), 60)
+
+    def test_non_object_response_not_cached(self):
+        """Ответ не JSON-объект: возвращается None, как без кэша, и ответ не сохраняется"""
+        with MockCBRServer(payload=[]) as server:
+            results = [
+                get_currencies(['USD'], url=server.url, session=self.session, cache=self.cache),
+                get_currencies(['USD'], url=server.url, session=self.session),
+                get_currencies(['USD'], url=server.url, session=self.session, cache=self.cache),
+            ]
+        self.assertEqual(results, [None] * 3)
+        self.assertEqual(server.requests, 3)
+        self.assertEqual(self.cache.stats()['hits'], 0)
+
+
+class TestCurrencyHistory(unittest.TestCase):
+    """Тесты загрузки истории курсов с локальным хранилищем"""
+
+    def setUp(self):
+        self.server = MockCBRServer(archive=weekday_archive).start()
+        self.archive_url = self.server.archive_url
+        self.session = create_session(backoff_factor=0)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'history.sqlite3')
+
+    def tearDown(self):
+        self.session.close()
+        self.server.stop()
+        self.tmpdir.cleanup()
+
+    def history(self, codes, start, end, store):
+        return get_currency_history(codes, start, end, store=store,
+                                    archive_url=self.archive_url, session=self.session)
+
+    def test_series_skips_days_without_document(self):
+        """Ряд содержит только рабочие дни; выходные (404) пропускаются"""
+        store = HistoryStore(self.path)
+        result = self.history(['USD', 'eur'], date(2024, 1, 5), date(2024, 1, 9), store)
+        store.close()
+
+        self.assertEqual(result['USD'].dates(), [date(2024, 1, 5), date(2024, 1, 8), date(2024, 1, 9)])
+        self.assertEqual(list(result['USD'].values), [5.0, 8.0, 9.0])
+        self.assertEqual(list(result['eur'].values), [105.0, 108.0, 109.0])
+        self.assertEqual(self.server.requests, 5)
+
+    def test_only_missing_days_fetched(self):
+        """Сохраненные даты не запрашиваются повторно, в том числе после переоткрытия файла"""
+        store = HistoryStore(self.path)
+        self.history(['USD'], date(2024, 1, 8), date(2024, 1, 10), store)
+        store.close()
+        self.assertEqual(self.server.requests, 3)
+
+        store = HistoryStore(self.path)
+        result = self.history(['EUR'], date(2024, 1, 6), date(2024, 1, 11), store)
+        store.close()
+        self.assertEqual(self.server.requests, 6)  # 6, 7 и 11 января
+        self.assertEqual(len(result['EUR']), 4)
+
+    def test_current_and_future_days_not_stored(self):
+        """Сегодняшняя и будущие даты (в том числе с 404) запрашиваются при каждом вызове"""
+        start, end = date.today(), date.today() + timedelta(days=6)
+        store = HistoryStore(self.path)
+        self.history(['USD'], start, end, store)
+        self.history(['USD'], start, end, store)
+        self.assertEqual(self.server.requests, 14)
+        self.assertEqual(len(store.missing_days(start, end)), 7)
+        store.close()
+
+    def test_unknown_currency(self):
+        """Неизвестная валюта обрабатывается как в get_currencies: возвращается None"""
+        store = HistoryStore(':memory:')
+        result = self.history(['XYZ'], date(2024, 1, 8), date(2024, 1, 9), store)
+        store.close()
+        self.assertIsNone(result)
+
+
+class TestPartialExtraction(unittest.TestCase):
+    """Тесты частичного разбора ответа"""
+
+    DOCUMENT = json.dumps({
+        'Date': '2024-05-10T11:30:00+03:00',
+        'Valute': {
+            code: {'ID': 'R0', 'CharCode': code, 'Nominal': 1, 'Name': 'Валюта', 'Value': value, 'Previous': 1.0}
+            for code, value in [('AUD', 60.1), ('EUR', 98.7), ('USD', 91.8), ('JPY', 59.3)]
+        }
+    }, ensure_ascii=False, indent=4)
+
+    def test_matches_full_parse(self):
+        """Частичный разбор дает тот же результат, что и полный"""
+        codes = ['usd', 'JPY', 'AUD']
+        self.assertEqual(
+            extract_rates_from_text(self.DOCUMENT, codes),
+            extract_rates(json.loads(self.DOCUMENT), codes)
+        )
+
+    def test_missing_currency(self):
+        """Отсутствующая валюта вызывает KeyError, как и при полном разборе"""
+        with self.assertRaises(KeyError):
+            extract_rates_from_text(self.DOCUMENT, ['XYZ'])
+        with self.assertRaises(KeyError):
+            extract_rates_from_text('{"Date": "2024-05-10"}', ['USD'])
+
+    def test_keys_outside_valute_ignored(self):
+        """Одноименный ключ вне Valute не считается курсом валюты"""
+        document = json.dumps({
+            'Meta': {'GBP': {'Value': 1.0}},
+            'Valute': {'USD': {'Value': 91.8, 'Nested': {'EUR': {'Value': 2.0}}}},
+            'Other': {'EUR': {'Value': 3.0}},
+        })
+        self.assertEqual(extract_rates_from_text(document, ['usd']), {'usd': 91.8})
+        for code in ('GBP', 'EUR'):
+            with self.assertRaises(KeyError):
+                extract_rates_from_text(document, [code])
+
+    def test_get_currencies_partial(self):
+        """get_currencies(partial=True) на локальном сервере"""
+        session = create_session(backoff_factor=0)
+        try:
+            with MockCBRServer(payload=PAYLOAD) as server:
+                result = get_currencies(['EUR'], url=server.url, session=session, partial=True)
+        finally:
+            session.close()
+        self.assertEqual(result, {'EUR': 85.2})
+
+    def test_benchmark_extraction(self):
+        """Бенчмарк возвращает пропускную способность всех способов"""
+        result = benchmark_extraction(self.DOCUMENT, ['USD'], runs=10)
+        self.assertEqual(set(result), {'full', 'partial', 'partial_cold'})
+        self.assertTrue(all(value > 0 for value in result.values()))
+
+    def test_snapshot_shared_between_calls(self):
+        """Тот же документ (в том числе новым объектом bytes) разбирается один раз"""
+        body = self.DOCUMENT.encode('utf-8')
+        with patch('main.json.loads', wraps=json.loads) as loads:
+            first = extract_rates_from_text(bytes(bytearray(body)), ['USD'])
+            second = extract_rates_from_text(bytes(bytearray(body)), ['eur', 'JPY'])
+        self.assertEqual(first, {'USD': 91.8})
+        self.assertEqual(second, {'eur': 98.7, 'JPY': 59.3})
+        self.assertLessEqual(loads.call_count, 1)
+
+    def test_partial_rejects_incompatible_options(self):
+        """partial=True вместе с кэшем, выключателем или объединителем — ошибка, а не тихое игнорирование"""
+        for option in ({'cache': RatesCache()}, {'breaker': CircuitBreaker()}, {'coalescer': RequestCoalescer()}):
+            with self.subTest(option=list(option)):
+                with self.assertRaises(ValueError):
+                    get_currencies.__wrapped__(['USD'], url='http://cbr.test', partial=True, **option)
+
+
+class TestRateTable(unittest.TestCase):
+    """Тесты таблицы кросс-курсов"""
+
+    def setUp(self):
+        self.table = RateTable.from_document({
+            'Date': '2024-05-10T11:30:00+03:00',
+            'Valute': {
+                'USD': {'Value': 90.0, 'Nominal': 1},
+                'EUR': {'Value': 99.0, 'Nominal': 1},
+                'JPY': {'Value': 60.0, 'Nominal': 100},
+            }
+        })
+
+    def test_convert(self):
+        """Конвертация учитывает Nominal и поддерживает рубль"""
+        self.assertAlmostEqual(self.table.convert(100, 'USD', 'RUB'), 9000.0)
+        self.assertAlmostEqual(self.table.convert(99, 'rub', 'eur'), 1.0)
+        self.assertAlmostEqual(self.table.convert(1, 'USD', 'JPY'), 150.0)
+        self.assertAlmostEqual(self.table.rate('EUR', 'USD'), 1.1)
+
+    def test_convert_many(self):
+        """Пакетная конвертация совпадает с поэлементной"""
+        amounts = [1, 2.5, 1000]
+        from_codes = ['USD', 'EUR', 'JPY']
+        to_codes = ['EUR', 'RUB', 'USD']
+        result = self.table.convert_many(amounts, from_codes, to_codes)
+        expected = [self.table.convert(a, f, t) for a, f, t in zip(amounts, from_codes, to_codes)]
+        for value, item in zip(result, expected):
+            self.assertAlmostEqual(value, item)
+        self.assertEqual(len(self.table.convert_many([], [], [])), 0)
+
+    def test_convert_many_without_numpy(self):
+        """Без NumPy пакетная конвертация выполняется циклом и возвращает array('d')"""
+        amounts, from_codes, to_codes = [1, 2.5], ['USD', 'EUR'], ['EUR', 'RUB']
+        expected = list(self.table.convert_many(amounts, from_codes, to_codes))
+        with patch.dict(sys.modules, {'numpy': None}):
+            result = self.table.convert_many(amounts, from_codes, to_codes)
+        self.assertEqual(result.typecode, 'd')
+        for value, item in zip(result, expected):
+            self.assertAlmostEqual(value, item)
+
+    def test_errors(self):
+        """Неизвестная валюта — KeyError, разные длины пакета — ValueError"""
+        with self.assertRaises(KeyError):
+            self.table.convert(1, 'USD', 'XYZ')
+        with self.assertRaises(ValueError):
+            self.table.convert_many([1, 2], ['USD'], ['EUR'])
+
+    def test_table_reused_for_cached_snapshot(self):
+        """При использовании кэша таблица строится один раз на снимок"""
+        session = create_session(backoff_factor=0)
+        cache = RatesCache()
+        try:
+            with MockCBRServer(payload=PAYLOAD) as server:
+                first = get_rate_table(server.url, session=session, cache=cache)
+                second = get_rate_table(server.url, session=session, cache=cache)
+        finally:
+            session.close()
+        self.assertIs(first, second)
+        self.assertAlmostEqual(first.convert(1, 'EUR', 'USD'), 85.2 / 75.5)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Тесты выключателя и выдачи устаревшего снимка"""
+
+    def setUp(self):
+        self.now = [0.0]
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=lambda: self.now[0])
+        self.session = MagicMock()
+        self.ok = MagicMock()
+        self.ok.json.return_value = {'Valute': {'USD': {'Value': 75.5}}}
+
+    def get(self):
+        return get_currencies(['USD'], url='http://cbr.test/daily_json.js',
+                              session=self.session, breaker=self.breaker)
+
+    def test_opens_after_repeated_failures(self):
+        """После порога ошибок запросы не выполняются"""
+        self.session.get.side_effect = requests.ConnectionError("down")
+        self.assertIsNone(self.get())
+        self.assertIsNone(self.get())
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        self.assertIsNone(self.get())
+        self.assertEqual(self.session.get.call_count, 2)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call('http://cbr.test/daily_json.js', lambda: None)
+
+    def test_serves_stale_snapshot(self):
+        """Во время сбоя возвращается последний успешный снимок с признаком stale"""
+        self.session.get.return_value = self.ok
+        fresh = self.get()
+        self.assertEqual(fresh, {'USD': 75.5})
+        self.assertFalse(getattr(fresh, 'stale', False))
+
+        self.session.get.side_effect = requests.Timeout("slow")
+        self.session.get.return_value = None
+        for _ in range(3):
+            result = self.get()
+            self.assertEqual(result, {'USD': 75.5})
+            self.assertTrue(result.stale)
+        self.assertEqual(self.session.get.call_count, 3)  # третий вызов — без запроса
+
+    def test_half_open_probe(self):
+        """После reset_timeout пробный запрос замыкает или снова размыкает цепь"""
+        self.session.get.side_effect = requests.ConnectionError("down")
+        self.get()
+        self.get()
+        self.now[0] = 30
+        self.get()  # пробный запрос неудачен
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.session.get.call_count, 3)
+
+        self.now[0] = 60
+        self.session.get.side_effect = None
+        self.session.get.return_value = self.ok
+        self.assertEqual(self.get(), {'USD': 75.5})
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_probe_cleared_on_unexpected_error(self):
+        """Необработанная ошибка пробного запроса не оставляет цепь без пробных запросов"""
+        url = 'http://cbr.test/daily_json.js'
+        self.session.get.side_effect = requests.ConnectionError("down")
+        self.get()
+        self.get()
+        self.now[0] = 30
+
+        def broken():
+            raise AttributeError("'list' object has no attribute 'get'")
+
+        with self.assertRaises(AttributeError):
+            self.breaker.call(url, broken)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        self.now[0] = 60
+        data, stale, _ = self.breaker.call(url, lambda: {'Valute': {}})
+        self.assertFalse(stale)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+
+class TestMetrics(unittest.TestCase):
+    """Тесты метрик фаз запроса, ошибок и кэша"""
+
+    def setUp(self):
+        self.metrics = Metrics()
+        self.previous = set_metrics(self.metrics)
+        self.server = MockCBRServer().start()
+        self.url = self.server.url
+        self.session = create_session(backoff_factor=0)
+
+    def tearDown(self):
+        set_metrics(self.previous)
+        self.session.close()
+        self.server.stop()
+
+    def test_phase_spans(self):
+        """Каждая фаза запроса записывается в сводку phase_seconds"""
+        get_currencies(['USD'], url=self.url, session=self.session)
+        for phase in ('request', 'download', 'parse', 'extract'):
+            count, total = self.metrics.summary('phase_seconds', {'phase': phase})
+            self.assertEqual(count, 1, msg=phase)
+            self.assertGreaterEqual(total, 0)
+
+    def test_errors_by_type(self):
+        """Ошибки считаются по типу исключения из log_errors"""
+        get_currencies(['XYZ'], url=self.url, session=self.session)
+        get_currencies([], url=self.url, session=self.session)
+        self.assertEqual(self.metrics.counter('errors_total', {'function': 'get_currencies', 'type': 'KeyError'}), 1)
+        self.assertEqual(self.metrics.counter('errors_total', {'function': 'get_currencies', 'type': 'ValueError'}), 1)
+
+    def test_cache_hit_ratio_and_endpoint(self):
+        """Доля попаданий в кэш доступна через эндпоинт /metrics"""
+        cache = RatesCache()
+        for _ in range(4):
+            get_currencies(['USD'], url=self.url, session=self.session, cache=cache)
+        self.assertEqual(self.metrics.cache_hit_ratio(), 0.75)
+
+        endpoint = serve_metrics(self.metrics)
+        try:
+            host, port = endpoint.server_address
+            with urllib.request.urlopen(f'http://{host}:{port}/metrics') as response:
+                text = response.read().decode()
+        finally:
+            endpoint.shutdown()
+            endpoint.server_close()
+        self.assertIn('currency_cache_requests_total{result="hit"} 3', text)
+        self.assertIn('currency_cache_hit_ratio 0.750000', text)
+        self.assertIn('currency_phase_seconds_count{phase="request"} 1', text)
+
+    def test_null_metrics_default(self):
+        """NullMetrics ничего не накапливает"""
+        metrics = NullMetrics()
+        with metrics.span('request'):
+            metrics.increment('errors_total', {'type': 'KeyError'})
+        self.assertFalse(hasattr(metrics, 'render'))
+
+
+class TestMockServerLoad(unittest.TestCase):
+    """Тесты имитатора API и нагрузочного драйвера"""
+
+    def test_recorded_payload(self):
+        """Имитатор отдает записанный документ ЦБ РФ"""
+        with MockCBRServer() as server:
+            session = create_session(backoff_factor=0)
+            result = get_currencies(['USD', 'JPY'], url=server.url, session=session)
+            session.close()
+        self.assertEqual(result, {'USD': 91.7791, 'JPY': 59.0232})
+
+    def test_errors_and_payload_size(self):
+        """Доля ошибок и размер документа настраиваются"""
+        with MockCBRServer(error_rate=1.0) as server:
+            session = create_session(retries=0)
+            self.assertIsNone(get_currencies(['USD'], url=server.url, session=session))
+            session.close()
+        self.assertEqual(server.errors, 1)
+        self.assertGreater(len(MockCBRServer(extra_currencies=100).body), len(MockCBRServer().body) * 5)
+
+    def test_load_test_uses_pool(self):
+        """Нагрузочный тест считает перцентили, и потоки переиспользуют соединения"""
+        with MockCBRServer(latency=0.002) as server:
+            session = create_session(backoff_factor=0)
+            result = run_load_test(
+                lambda: get_currencies(['USD'], url=server.url, session=session),
+                threads=4, requests_total=40
+            )
+            session.close()
+        self.assertEqual(result['requests'], 40)
+        self.assertEqual(result['errors'], 0)
+        self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+        self.assertGreater(result['rps'], 0)
+        self.assertLessEqual(server.connections, 4)
+
+    def test_async_load_test(self):
+        """Асинхронный режим нагрузочного теста"""
+        with MockCBRServer() as server:
+            session = create_session(backoff_factor=0)
+            result = run_async_load_test(
+                lambda: async_get_currencies(['EUR'], url=server.url, session=session),
+                tasks=4, requests_total=20
+            )
+            session.close()
+        self.assertEqual((result['requests'], result['errors']), (20, 0))
+
+    def test_percentile(self):
+        """Перцентиль по методу ближайшего ранга"""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 50), 0.0)
+
+
+class TestRequestCoalescer(unittest.TestCase):
+    """Тесты объединения одновременных запросов"""
+
+    def call_concurrently(self, server, code_lists, coalescer, breaker=None):
+        session = create_session(retries=0)
+        results = [None] * len(code_lists)
+
+        def worker(i, codes):
+            results[i] = get_currencies(codes, url=server.url, session=session, coalescer=coalescer,
+                                        breaker=breaker)
+
+        threads = [threading.Thread(target=worker, args=item) for item in enumerate(code_lists)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        session.close()
+        return results
+
+    def test_one_fetch_for_concurrent_callers(self):
+        """Одновременные вызовы с разными кодами выполняют один запрос"""
+        coalescer = RequestCoalescer(window=0.05)
+        code_lists = [['USD'], ['EUR', 'JPY'], ['usd', 'XYZ'], ['GBP']] * 3
+        with MockCBRServer(latency=0.1) as server:
+            results = self.call_concurrently(server, code_lists, coalescer)
+
+        self.assertEqual(server.requests, 1)
+        self.assertEqual(coalescer.stats(), {'fetches': 1, 'coalesced': 11})
+        self.assertEqual(results[0], {'USD': 91.7791})
+        self.assertEqual(results[1], {'EUR': 98.8186, 'JPY': 59.0232})
+        self.assertIsNone(results[2])  # KeyError только у вызова с неизвестной валютой
+        self.assertEqual(results[3], {'GBP': 114.9377})
+
+    def test_error_propagates_to_every_caller(self):
+        """Ошибку запроса получают все ожидающие вызовы"""
+        coalescer = RequestCoalescer(window=0.05)
+        with MockCBRServer(error_rate=1.0) as server:
+            results = self.call_concurrently(server, [['USD']] * 5, coalescer)
+        self.assertEqual(results, [None] * 5)
+        self.assertEqual(server.requests, 1)
+
+    def test_breaker_counts_coalesced_failure_once(self):
+        """Сбой одного объединенного запроса учитывается выключателем один раз"""
+        coalescer = RequestCoalescer(window=0.05)
+        breaker = CircuitBreaker(failure_threshold=5)
+        with MockCBRServer(error_rate=1.0) as server:
+            results = self.call_concurrently(server, [['USD']] * 5, coalescer, breaker)
+        self.assertEqual(results, [None] * 5)
+        self.assertEqual(server.requests, 1)
+        self.assertEqual(coalescer.stats(), {'fetches': 1, 'coalesced': 4})
+        self.assertEqual((breaker.failures, breaker.state), (1, CircuitBreaker.CLOSED))
+
+        # Успешный запрос: все вызовы получают курсы, выключатель сброшен
+        with MockCBRServer() as server:
+            results = self.call_concurrently(server, [['USD']] * 3, coalescer, breaker)
+        self.assertEqual(results, [{'USD': 91.7791}] * 3)
+        self.assertEqual(breaker.failures, 0)
+
+    def test_waiters_get_own_exception(self):
+        """Каждый ожидающий вызов получает свою копию исключения ведущего"""
+        coalescer = RequestCoalescer()
+        started = threading.Event()
+        release = threading.Event()
+        errors = []
+
+        def fetch():
+            started.set()
+            release.wait(2)
+            raise requests.ConnectionError("down")
+
+        def call():
+            try:
+                coalescer.get('url', fetch)
+            except requests.ConnectionError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(2)
+        waiters = [threading.Thread(target=call) for _ in range(3)]
+        for thread in waiters:
+            thread.start()
+        while coalescer.stats()['coalesced'] < 3:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader] + waiters:
+            thread.join()
+
+        self.assertEqual(coalescer.stats(), {'fetches': 1, 'coalesced': 3})
+        self.assertEqual(len({id(e) for e in errors}), 4)
+        original = [e for e in errors if e.__cause__ is None]
+        self.assertEqual(len(original), 1)
+        self.assertTrue(all(e.__cause__ is original[0] for e in errors if e is not original[0]))
+        self.assertTrue(all(str(e) == "down" for e in errors))
+
+    def test_no_window_by_default(self):
+        """По умолчанию ведущий не ждет перед запросом: окно сбора включается явно"""
+        coalescer = RequestCoalescer()
+        self.assertEqual(coalescer.window, 0)
+        with patch('coalescer.time.sleep') as sleep:
+            self.assertEqual(coalescer.get('url', lambda: {'Valute': {}}), {'Valute': {}})
+        sleep.assert_not_called()
+
+    def test_sequential_calls_not_cached(self):
+        """После завершения запроса следующий вызов выполняет новый запрос"""
+        coalescer = RequestCoalescer(window=0)
+        with MockCBRServer() as server:
+            self.call_concurrently(server, [['USD']], coalescer)
+            self.call_concurrently(server, [['USD']], coalescer)
+        self.assertEqual(server.requests, 2)
+
+
+class TestAsyncCurrencies(unittest.IsolatedAsyncioTestCase):
+    """Тесты асинхронного получения курсов"""
+
+    def setUp(self):
+        # Задержка 0.5 с на каждый ответ: последовательная загрузка заметно дольше одновременной
+        self.server = MockCBRServer(payload=PAYLOAD, latency=0.5).start()
+        self.session = create_session(backoff_factor=0)
+        self.dates = [date(2024, 1, day) for day in range(10, 14)]
+
+    def tearDown(self):
+        self.session.close()
+        self.server.stop()
+
+    async def test_daily_document(self):
+        """Без дат возвращается тот же результат, что и у get_currencies"""
+        result = await async_get_currencies(['usd'], url=self.server.url, session=self.session)
+        self.assertEqual(result, {'usd': 75.5})
+
+    async def test_archive_dates_fetched_concurrently(self):
+        """Архивные даты и текущий документ загружаются одновременно"""
+        started = time.perf_counter()
+        result = await async_get_currencies(
+            ['USD'], dates=[None] + self.dates,
+            url=self.server.url, archive_url=self.server.archive_url,
+            session=self.session
+        )
+        elapsed = time.perf_counter() - started
+        self.assertEqual(list(result), [None] + self.dates)
+        self.assertTrue(all(rates == {'USD': 75.5} for rates in result.values()))
+        self.assertLess(elapsed, 1.5)  # последовательно было бы 2.5 с
+
+    async def test_bounded_concurrency(self):
+        """Одновременно выполняется не более max_concurrency запросов"""
+        await async_get_currencies(
+            ['USD'], dates=self.dates, archive_url=self.server.archive_url,
+            session=self.session, max_concurrency=2
+        )
+        self.assertEqual(self.server.requests, 4)
+        self.assertLessEqual(self.server.max_active, 2)
+
+    async def test_error_returns_none(self):
+        """Ошибки обрабатываются как в log_errors: возвращается None"""
+        result = await async_get_currencies(['XYZ'], url=self.server.url, session=self.session)
+        self.assertIsNone(result)
+
+
 if __name__ == '__main__':
     # Запуск тестов с более подробным выводом
     runner = unittest.TextTestRunner(verbosity=2)
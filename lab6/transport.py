@@ -0,0 +1,77 @@
+"""
+HTTP-транспорт для API ЦБ РФ.
+
+Сессия с пулом keep-alive соединений и повторными попытками (create_session),
+загрузка документа с замером фаз request/download (download) и разбор
+тела ответа с замером фазы parse (parse_document).
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from metrics import get_metrics
+
+
+# Таймауты по умолчанию: (подключение, чтение) в секундах
+DEFAULT_TIMEOUT = (3.05, 10)
+
+
+def create_session(pool_connections=4, pool_maxsize=16, retries=3, backoff_factor=0.5):
+    """
+    Создает HTTP-сессию с пулом соединений и повторными попытками
+    
+    Args:
+        pool_connections (int): Количество пулов (по одному на хост)
+        pool_maxsize (int): Максимальное число соединений в пуле одного хоста
+        retries (int): Количество повторных попыток при сетевых ошибках и кодах 429/5xx
+        backoff_factor (float): Коэффициент экспоненциальной задержки между попытками
+    
+    Returns:
+        requests.Session: Сессия с keep-alive соединениями
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def parse_document(response):
+    """
+    Разбирает тело ответа API (фаза parse)
+    
+    Raises:
+        ValueError: Если тело не является JSON-объектом (например, [] или null)
+    """
+    with get_metrics().span('parse'):
+        data = response.json()
+    if not isinstance(data, dict):
+        raise ValueError("Ответ API не является JSON-объектом")
+    return data
+
+
+def download(session, url, timeout, headers=None):
+    """
+    Выполняет запрос с замером фаз request (DNS, подключение, ожидание заголовков)
+    и download (чтение тела ответа)
+    """
+    metrics = get_metrics()
+    with metrics.span('request'):
+        response = session.get(url, timeout=timeout, headers=headers, stream=True)
+    with metrics.span('download'):
+        response.content
+    return response